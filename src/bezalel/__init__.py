@@ -1,9 +1,19 @@
+from .impl.AsyncCursorApiIterator import *
+from .impl.AsyncPaginatedApiIterator import *
 from .impl.BufferingIterator import *
 from .impl.CursorApiIterator import *
+from .impl.JobManager import *
 from .impl.normalize_dicts import *
 from .impl.normalize_with_prototype import *
 from .impl.PaginatedApiIterator import *
+from .impl.parallel_normalize import *
+from .impl.RateLimiter import *
+from .impl.RecordIterator import *
+from .impl.RetryPolicy import *
 from .impl.prepare_job import *
 
-__all__ = ["BufferingIterator", "CursorApiIterator", "normalize_dicts", "normalize_with_prototype",
-           "PaginatedApiIterator", "prepare_job"]
+__all__ = ["AsyncCursorApiIterator", "AsyncPaginatedApiIterator", "AsyncRecordIterator", "BufferingIterator",
+           "compile_prototype", "CursorApiIterator", "iter_normalize_dicts", "Job", "JobManager", "normalize_dicts",
+           "normalize_dicts_columnar", "normalize_many", "normalize_with_prototype",
+           "PaginatedApiIterator", "parallel_normalize_dicts", "parallel_normalize_with_prototype", "prepare_job",
+           "RateLimiter", "RecordIterator", "RetryPolicy", "RetryStats", "ShapeCache"]
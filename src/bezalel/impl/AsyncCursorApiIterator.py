@@ -0,0 +1,46 @@
+from .CursorApiIterator import CursorApiIterator
+from .RecordIterator import AsyncRecordIterator
+from .http_utils import async_request_json
+
+
+class AsyncCursorApiIterator(CursorApiIterator):
+    """
+    `async for` counterpart of `CursorApiIterator`. Takes the same parameters, but `session` is an async HTTP
+    client, i.e. `httpx.AsyncClient` or `aiohttp.ClientSession`.
+    """
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        """
+        :param timeout: passed to the async client as is; None means the client's default timeout.
+        """
+        super().__init__(*args, timeout=timeout, **kwargs)
+        if self._stream_records:
+            raise Exception("stream_records is not supported by async iterators.")
+
+    def __aiter__(self):
+        self.__iter__()
+        return self
+
+    def records(self) -> AsyncRecordIterator:
+        """
+        Returns an async iterator over single records of all pages.
+        """
+        return AsyncRecordIterator(self)
+
+    async def __anext__(self):
+        self._checkpoint(force=self._completed)
+        if self._completed:
+            raise StopAsyncIteration
+        params, data = self._build_request(self._next_cursor)
+
+        response_json = await async_request_json(self._session, self._method, self._url,
+                                                 headers=self._request_headers, params=params, json=data,
+                                                 timeout=self._timeout, retry_policy=self._retry_policy,
+                                                 rate_limiter=self._rate_limiter)
+
+        records, self._next_cursor = self._parse_response(response_json, params, data, self.page_number)
+        self._completed = not self._next_cursor
+        self.page_number += 1
+
+        self._page_returned()
+        return records
@@ -0,0 +1,102 @@
+import asyncio
+from collections import deque
+
+from .PaginatedApiIterator import PaginatedApiIterator
+from .RecordIterator import AsyncRecordIterator
+from .http_utils import async_request_json
+
+
+class AsyncPaginatedApiIterator(PaginatedApiIterator):
+    """
+    `async for` counterpart of `PaginatedApiIterator`. Takes the same parameters, but `session` is an async HTTP
+    client, i.e. `httpx.AsyncClient` or `aiohttp.ClientSession`.
+
+    With `max_workers` set, remaining pages are fetched as concurrent tasks on the running event loop.
+    """
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        """
+        :param timeout: passed to the async client as is; None means the client's default timeout.
+        """
+        super().__init__(*args, timeout=timeout, **kwargs)
+        if self._stream_records:
+            raise Exception("stream_records is not supported by async iterators.")
+
+    def __aiter__(self):
+        self.logger.debug(f"Downloading from {self._url}")
+        self._cancel_tasks()
+        self._reset_position(self._initial_state())
+        return self
+
+    async def __anext__(self):
+        self._checkpoint(force=self._completed)
+        if self._completed:
+            raise StopAsyncIteration
+
+        if self._pending:
+            return await self._anext_concurrent()
+
+        records, page_count = await self._fetch_page_async(self.page_number)
+
+        self.page_number += 1
+
+        self._last_page_number = page_count if self._start_page_number_from_1 else page_count - 1
+        if self.page_number > self._last_page_number:
+            self._completed = True
+        elif self._max_workers is not None and self._max_workers > 1:
+            self._next_page_to_submit = self.page_number
+            self._submit_tasks()
+
+        self._page_returned()
+        return records
+
+    def records(self) -> AsyncRecordIterator:
+        """
+        Returns an async iterator over single records of all pages.
+        """
+        return AsyncRecordIterator(self)
+
+    async def aclose(self):
+        self._completed = True
+        self._cancel_tasks()
+
+    def _submit_tasks(self):
+        while len(self._pending) < self._max_workers and self._next_page_to_submit <= self._last_page_number:
+            self._pending.append(asyncio.ensure_future(self._fetch_page_async(self._next_page_to_submit)))
+            self._next_page_to_submit += 1
+
+    async def _anext_concurrent(self):
+        if self._preserve_order:
+            task = self._pending.popleft()
+        else:
+            done, _ = await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+            task = done.pop()
+            self._pending.remove(task)
+
+        try:
+            records, _ = await task
+        except BaseException:
+            await self.aclose()
+            raise
+
+        self.page_number += 1
+        self._submit_tasks()
+        if not self._pending:
+            self._completed = True
+        self._page_returned()
+        return records
+
+    def _cancel_tasks(self):
+        for task in self._pending:
+            task.cancel()
+        self._pending = deque()
+
+    async def _fetch_page_async(self, page_number):
+        request_params, request_data = self._build_request(page_number)
+
+        response_json = await async_request_json(self._session, self._http_method, self._url,
+                                                 headers=self._request_headers, params=request_params,
+                                                 json=request_data, timeout=self._timeout,
+                                                 retry_policy=self._retry_policy, rate_limiter=self._rate_limiter)
+
+        return self._parse_response(response_json, page_number)
@@ -0,0 +1,72 @@
+import queue
+import threading
+
+
+class _End:
+    pass
+
+
+class _Error:
+    def __init__(self, exception):
+        self.exception = exception
+
+
+class BackgroundIterator:
+    """
+    Iterates `it` on a background thread, so that producing next elements overlaps with consuming the current one.
+    At most `queue_size` produced elements wait in a queue. Exceptions raised by `it` are re-raised by `__next__`.
+    Call `close()` to stop the background thread before `it` is exhausted.
+    """
+    def __init__(self, it, queue_size: int = 1):
+        if queue_size < 1:
+            raise Exception(f"Wrong parameter value queue_size={queue_size}")
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._finished = False
+        self._thread = threading.Thread(target=self._produce, args=(iter(it),), daemon=True)
+        self._thread.start()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._finished:
+            raise StopIteration
+        item = self._queue.get()
+        if isinstance(item, _End):
+            self._finished = True
+            raise StopIteration
+        if isinstance(item, _Error):
+            self._finished = True
+            raise item.exception
+        return item
+
+    def close(self):
+        self._finished = True
+        self._stop.set()
+        # unblock the producer if it waits for free space in the queue
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self._thread.join()
+
+    def _produce(self, it):
+        try:
+            for item in it:
+                if not self._put(item):
+                    return
+        except BaseException as e:
+            self._put(_Error(e))
+            return
+        self._put(_End())
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
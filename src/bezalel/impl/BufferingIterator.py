@@ -1,34 +1,124 @@
-from collections import deque
-import itertools
+import json
+import time
+import typing as t
+
+from .BackgroundIterator import BackgroundIterator
 
 
 def combine_func_join_arrays(array_of_arrays):
-    return list(itertools.chain(*array_of_arrays))
+    combined = []
+    for array in array_of_arrays:
+        combined.extend(array)
+    return combined
+
+
+def estimate_json_size(page) -> int:
+    """
+    Approximate size of a page in bytes: length of its JSON representation.
+    """
+    return len(json.dumps(page, default=str))
 
 
 class BufferingIterator:
-    def __init__(self, it, buffer_size, combine_func=combine_func_join_arrays):
+    def __init__(self, it, buffer_size: t.Optional[int] = None, combine_func=combine_func_join_arrays,
+                 max_records: t.Optional[int] = None,
+                 max_bytes: t.Optional[int] = None,
+                 max_seconds: t.Optional[float] = None,
+                 size_func: t.Callable[[t.Any], int] = estimate_json_size,
+                 background: bool = False,
+                 queue_size: int = 1):
+        """
+        Groups pages returned by `it` into buffers. A buffer is returned as soon as any of the limits is reached
+        (or `it` is exhausted).
+
+        :param it: iterator of pages (lists of records).
+        :param buffer_size: max number of pages in a buffer.
+        :param combine_func: function combining list of pages into one buffer. Default joins pages into one list,
+            adding records of each page as soon as it is fetched, so pages are not copied again.
+        :param max_records: max number of records in a buffer. A buffer may be bigger by less than one page.
+        :param max_bytes: approximate max size of a buffer in bytes, as measured by `size_func`.
+            A buffer may be bigger by less than one page.
+        :param max_seconds: max time since the first page of a buffer was fetched. It is checked when a page arrives,
+            so a slow page can make a buffer older than that.
+        :param size_func: function returning approximate size of a page in bytes. Default serializes the page to
+            JSON, which is precise but costs CPU; pass something cheaper if you know your data.
+        :param background: if True, next buffers are filled on a background thread while the consumer processes
+            the current one. Exceptions raised by `it` are re-raised by `__next__`. Call `close()` to stop the
+            thread if you don't consume all buffers.
+        :param queue_size: used only with `background`: how many ready buffers may wait for the consumer.
+        """
+        if buffer_size is None and max_records is None and max_bytes is None and max_seconds is None:
+            raise Exception("At least one of buffer_size, max_records, max_bytes, max_seconds must be provided.")
         self._it = iter(it)
         self._buffer_size = buffer_size
         self._combine_func = combine_func
+        self._max_records = max_records
+        self._max_bytes = max_bytes
+        self._max_seconds = max_seconds
+        self._size_func = size_func
+        self._background = BackgroundIterator(self._iter_buffers(), queue_size=queue_size) if background else None
 
     def __iter__(self):
         return self
 
     def __next__(self):
+        if self._background is not None:
+            return next(self._background)
+        return self._next_buffer()
+
+    def close(self):
+        """
+        Stops filling buffers in background (only relevant when `background` is set).
+        """
+        if self._background is not None:
+            self._background.close()
+
+    def _iter_buffers(self):
+        while True:
+            try:
+                buffer = self._next_buffer()
+            except StopIteration:
+                return
+            yield buffer
+
+    def _next_buffer(self):
         if self._it is None:
             raise StopIteration
 
-        pages = deque()
+        join_arrays = self._combine_func is combine_func_join_arrays
+        buffer = []
+        pages_count = 0
+        records_count = 0
+        bytes_count = 0
+        started_at = None
 
-        for i in range(0, self._buffer_size):
+        while True:
             val = next(self._it, None)
             if val is None:
                 self._it = None
-                if not pages:
+                if pages_count == 0:
                     # edge case, never had any lines to begin with
                     raise StopIteration
                 break
-            pages.append(val)
+            if started_at is None:
+                started_at = time.monotonic()
+            pages_count += 1
+            if join_arrays:
+                buffer.extend(val)
+                records_count = len(buffer)
+            else:
+                buffer.append(val)
+                if self._max_records is not None:
+                    records_count += len(val)
+            if self._max_bytes is not None:
+                bytes_count += self._size_func(val)
+
+            if self._buffer_size is not None and pages_count >= self._buffer_size or \
+                    self._max_records is not None and records_count >= self._max_records or \
+                    self._max_bytes is not None and bytes_count >= self._max_bytes or \
+                    self._max_seconds is not None and time.monotonic() - started_at >= self._max_seconds:
+                break
 
-        return self._combine_func(pages)
+        if join_arrays:
+            return buffer
+        return self._combine_func(buffer)
@@ -0,0 +1,61 @@
+import typing as t
+
+
+class CheckpointingIterator:
+    """
+    Base class of API iterators that can save their position and resume from it later.
+
+    Subclasses implement `state()` (a JSON-serializable dict) and `_apply_state(state)`, call
+    `_init_checkpointing(...)` in `__init__`, `_reset_position()` in `__iter__`, `_checkpoint(...)` before fetching
+    next page and `_page_returned()` when a page is handed to the consumer.
+    """
+
+    def _init_checkpointing(self, checkpoint_handler: t.Optional[t.Callable[[dict], None]],
+                            checkpoint_every_n_pages: int):
+        if checkpoint_every_n_pages < 1:
+            raise Exception(f"Wrong parameter value checkpoint_every_n_pages={checkpoint_every_n_pages}")
+        self._checkpoint_handler = checkpoint_handler
+        self._checkpoint_every_n_pages = checkpoint_every_n_pages
+        self._pages_since_checkpoint = 0
+        self._resume_state = None
+
+    @classmethod
+    def from_state(cls, state: t.Optional[dict], *args, **kwargs):
+        """
+        Creates iterator (passing `args` and `kwargs` to constructor) that resumes from `state` returned by
+        `state()` or passed to `checkpoint_handler`. If `state` is None, iteration starts from the beginning.
+        """
+        it = cls(*args, **kwargs)
+        it.restore_state(state)
+        return it
+
+    def restore_state(self, state: t.Optional[dict]):
+        """
+        Makes next iteration start from `state` instead of the beginning.
+        """
+        self._resume_state = dict(state) if state is not None else None
+
+    def state(self) -> dict:
+        raise NotImplementedError()
+
+    def _apply_state(self, state: dict):
+        raise NotImplementedError()
+
+    def _reset_position(self, initial_state: dict):
+        self._apply_state(self._resume_state if self._resume_state is not None else initial_state)
+        self._pages_since_checkpoint = 0
+
+    def _page_returned(self):
+        self._pages_since_checkpoint += 1
+
+    def _checkpoint(self, force: bool = False):
+        """
+        Calls `checkpoint_handler` with current state, if `checkpoint_every_n_pages` pages were returned since last
+        checkpoint (or at least one page and `force`). It is called when the consumer asks for the next page,
+        so all returned pages have been processed.
+        """
+        if self._checkpoint_handler is None or self._pages_since_checkpoint == 0:
+            return
+        if force or self._pages_since_checkpoint >= self._checkpoint_every_n_pages:
+            self._checkpoint_handler(self.state())
+            self._pages_since_checkpoint = 0
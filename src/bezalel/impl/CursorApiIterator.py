@@ -2,8 +2,14 @@ import requests
 import logging
 import typing as t
 
+from .BackgroundIterator import BackgroundIterator
+from .CheckpointingIterator import CheckpointingIterator
+from .http_utils import send_request
+from .RecordIterator import RecordIterator
+from .streaming_json import StreamedPage
 
-class CursorApiIterator:
+
+class CursorApiIterator(CheckpointingIterator):
     def __init__(self,
                  session: requests.Session,
                  url: str,
@@ -17,7 +23,13 @@ class CursorApiIterator:
                  extra_headers: t.Optional[dict] = None,
                  empty_data_on_next_cursor: bool=False,
                  payload_handler=None,
-                 timeout=(10, 60)):
+                 timeout=(10, 60),
+                 prefetch_pages: int = 0,
+                 stream_records: bool = False,
+                 retry_policy=None,
+                 rate_limiter=None,
+                 checkpoint_handler=None,
+                 checkpoint_every_n_pages: int = 1):
         """
 
         :param session: requests.Session object (you can set session.auth = (user, passwd) for authentication)
@@ -32,6 +44,18 @@ class CursorApiIterator:
         :param extra_headers:
         :param empty_data_on_next_cursor: Flase
         :param payload_handler: a function that is called just after fetching next page. Takes dict as a param.
+        :param prefetch_pages: if greater than 0, pages are downloaded on a background thread, up to
+            `prefetch_pages` pages ahead of the consumer. Then `payload_handler` is called on that thread too.
+        :param stream_records: if True, each page is returned as an iterator of records decoded incrementally from
+            the response stream, so a whole page is never held in memory. Requires `ijson` package. A page must be
+            consumed (or abandoned) before the next one is requested, and `payload_handler` gets the payload
+            without records. Can't be used with `prefetch_pages`.
+        :param retry_policy: optional `RetryPolicy` for retrying failed requests.
+        :param rate_limiter: optional `RateLimiter`, which may be shared with other iterators.
+        :param checkpoint_handler: a function that is called with `state()` every `checkpoint_every_n_pages` pages
+            (and after the last page), once the consumer has processed them. Store it somewhere and pass it to
+            `from_state()` to resume an interrupted download.
+        :param checkpoint_every_n_pages: see `checkpoint_handler`.
         """
         self.logger = logging.getLogger(__name__)
         self._session = session
@@ -54,54 +78,159 @@ class CursorApiIterator:
                 self._request_headers[k] = v
         self._empty_data_on_next_cursor = empty_data_on_next_cursor
         self._payload_handler = payload_handler
+        if prefetch_pages < 0:
+            raise Exception(f"Wrong parameter value prefetch_pages={prefetch_pages}")
+        self._prefetch_pages = prefetch_pages
+        self._prefetched = None
+        if stream_records and prefetch_pages > 0:
+            raise Exception("stream_records can't be used together with prefetch_pages.")
+        self._stream_records = stream_records
+        self._streamed_page = None
+        self._streamed_request = None
+        self._retry_policy = retry_policy
+        self._rate_limiter = rate_limiter
+        self._init_checkpointing(checkpoint_handler, checkpoint_every_n_pages)
         self._completed = False
         self._next_cursor = None
         self.page_number = 1
 
     def __iter__(self):
         self.logger.debug(f"Downloading from {self._url}")
-        self._completed = False
-        self._next_cursor = None
-        self.page_number = 1
+        self.close()
+        self._reset_position({"next_cursor": None, "page_number": 1, "completed": False})
         return self
 
     def __next__(self):
+        if self._stream_records:
+            return self._next_streamed()
+
+        self._checkpoint(force=self._completed)
+        if self._completed:
+            raise StopIteration
+
+        if self._prefetch_pages > 0:
+            if self._prefetched is None:
+                self._prefetched = BackgroundIterator(self._iter_pages(self._next_cursor, self.page_number),
+                                                      queue_size=self._prefetch_pages)
+            try:
+                records, next_cursor = next(self._prefetched)
+            except BaseException:
+                self.close()
+                raise
+        else:
+            records, next_cursor = self._fetch_page(self._next_cursor, self.page_number)
+
+        self._next_cursor = next_cursor
+        self._completed = not self._next_cursor
+        self.page_number += 1
+        if self._completed:
+            self.close()
+
+        self._page_returned()
+        return records
+
+    def state(self) -> dict:
+        """
+        Returns position of the iterator: the cursor of the page that will be returned next.
+        """
+        return {"next_cursor": self._next_cursor, "page_number": self.page_number, "completed": self._completed}
+
+    def _apply_state(self, state: dict):
+        self._next_cursor = state["next_cursor"]
+        self.page_number = state["page_number"]
+        self._completed = state["completed"]
+
+    def records(self) -> RecordIterator:
+        """
+        Returns an iterator over single records of all pages.
+        """
+        return RecordIterator(self)
+
+    def close(self):
+        """
+        Stops fetching pages in background (when `prefetch_pages` is set) and closes the streamed page.
+        """
+        if self._prefetched is not None:
+            self._prefetched.close()
+            self._prefetched = None
+        if self._streamed_page is not None:
+            self._streamed_page.close()
+            self._streamed_page = None
+
+    def _next_streamed(self):
+        if self._streamed_page is not None:
+            response_json = self._streamed_page.drain()
+            params, data = self._streamed_request
+            _, self._next_cursor = self._parse_response(response_json, params, data, self.page_number - 1,
+                                                        records_count=self._streamed_page.records_count)
+            self._streamed_page = None
+            self._completed = not self._next_cursor
+
+        self._checkpoint(force=self._completed)
         if self._completed:
             raise StopIteration
+
+        params, data = self._build_request(self._next_cursor)
+        response = self._send_request(params, data, stream=True)
+        self._streamed_page = StreamedPage(response, self._response_records_field_name)
+        self._streamed_request = params, data
+        self.page_number += 1
+        self._page_returned()
+
+        return self._streamed_page
+
+    def _iter_pages(self, cursor, page_number):
+        while True:
+            records, cursor = self._fetch_page(cursor, page_number)
+            yield records, cursor
+            if not cursor:
+                return
+            page_number += 1
+
+    def _fetch_page(self, cursor, page_number):
+        params, data = self._build_request(cursor)
+
+        response = self._send_request(params, data)
+
+        return self._parse_response(response.json(), params, data, page_number)
+
+    def _send_request(self, params, data, stream=False):
+        return send_request(self._session, self._method, self._url, retry_policy=self._retry_policy,
+                            rate_limiter=self._rate_limiter, headers=self._request_headers, params=params, json=data,
+                            timeout=self._timeout, stream=stream)
+
+    def _build_request(self, cursor):
         if self._extra_params or self._request_cursor_param_name:
             params = {}
             if self._extra_params:
                 params = {**self._extra_params}
-            params[self._request_cursor_param_name] = self._next_cursor
+            params[self._request_cursor_param_name] = cursor
         else:
             params = None
 
         if self._extra_data or self._request_cursor_field_name:
             data = {}
 
-            if self._extra_data and (not self._empty_data_on_next_cursor or not self._next_cursor):
+            if self._extra_data and (not self._empty_data_on_next_cursor or not cursor):
                 data = {**self._extra_data}
 
-            if self._request_cursor_field_name and self._next_cursor:
-                data[self._request_cursor_field_name] = self._next_cursor
+            if self._request_cursor_field_name and cursor:
+                data[self._request_cursor_field_name] = cursor
         else:
             data = None
 
-        response = self._session.request(method=self._method, url=self._url, headers=self._request_headers, params=params, json=data, timeout=self._timeout)
-        response.raise_for_status()
-
-        response_json = response.json()
+        return params, data
 
+    def _parse_response(self, response_json, params, data, page_number, records_count=None):
         if self._payload_handler:
             self._payload_handler(response_json)
 
-        if self._response_records_field_name not in response_json.keys():
+        if self._response_records_field_name not in response_json:
             raise Exception(f"Failed to get field '{self._response_records_field_name}' from response {response_json}. Request params: '{params}' data: '{data}'")
 
-        self._next_cursor = response_json.get(self._response_cursor_field_name)
-        self._completed = not self._next_cursor
-        self.logger.debug(
-            f"Downloaded page {self.page_number}. Items collected: {len(response_json[self._response_records_field_name])}")
-        self.page_number += 1
+        next_cursor = response_json.get(self._response_cursor_field_name)
+        if records_count is None:
+            records_count = len(response_json[self._response_records_field_name])
+        self.logger.debug(f"Downloaded page {page_number}. Items collected: {records_count}")
 
-        return response_json[self._response_records_field_name]
+        return response_json[self._response_records_field_name], next_cursor
@@ -0,0 +1,262 @@
+import concurrent.futures
+import heapq
+import itertools
+import logging
+import time
+import typing as t
+
+import requests
+
+from .prepare_job import _job_headers, _submit_job, _poll_job
+
+
+class Job:
+    """
+    A job submitted with `JobManager.submit()`.
+
+    - `params`: fields sent in the request creating the job
+    - `job_id`: id of the job, once it's created
+    - `state`: last polled state
+    - `response_json`: last polled response
+    - `error`: exception, if the job failed, couldn't be created or polled, or didn't finish before the deadline
+      (or if its download failed)
+    - `result`: value returned by `download_func`, see `JobManager.as_completed()`
+    """
+    def __init__(self, params: dict):
+        self.params = params
+        self.job_id = None
+        self.state = None
+        self.response_json = None
+        self.error = None
+        self.result = None
+        self.polls = 0
+        self.poll_seconds = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        return f"Job(job_id={self.job_id!r}, state={self.state!r}, error={self.error!r})"
+
+
+class JobManager:
+    """
+    Creates many jobs (see `prepare_job()`) and polls all of them from a single scheduler loop.
+
+    Each job is polled first after `initial_poll_seconds`. Every time it's still in one of `waiting_states`, its
+    poll interval is multiplied by `poll_backoff_factor`, up to `max_poll_seconds`. Requests are sent on a thread pool
+    of `max_workers` threads, so that a slow response doesn't delay polling of other jobs.
+
+    ```
+    with JobManager(session, url, "jobId", "state", ["DONE"], ["QUEUED", "RUNNING"], deadline_seconds=3600) as jobs:
+        for params in all_params:
+            jobs.submit(params)
+        for job in jobs.as_completed():
+            ...
+    ```
+
+    With `download_func`, results of each job are downloaded as soon as the job succeeds, on a pool of
+    `max_download_workers` threads, while other jobs are still polled:
+
+    ```
+        for job in jobs.as_completed(download_func=lambda job: list(PaginatedApiIterator(
+                session, url=f"{url}/{job.job_id}/result", ...))):
+            save(job.result)
+    ```
+    """
+    def __init__(self, session: requests.Session, url: str,
+                 response_job_id_field_name: str,
+                 response_state_field_name: str,
+                 successful_states: [str],
+                 waiting_states: [str],
+                 extra_headers: dict = {},
+                 initial_poll_seconds: float = 1,
+                 max_poll_seconds: float = 60,
+                 poll_backoff_factor: float = 1.5,
+                 deadline_seconds: t.Optional[float] = None,
+                 max_workers: int = 4,
+                 max_download_workers: int = 4,
+                 timeout=(10, 60),
+                 retry_policy=None,
+                 rate_limiter=None,
+                 ):
+        """
+
+        :param deadline_seconds: if given, jobs not finished within that time from the first call of `as_completed()`
+            are returned with an `error`.
+        :param max_workers: number of threads sending requests.
+        :param max_download_workers: number of threads running `download_func` of `as_completed()`.
+        See `prepare_job()` for other parameters.
+        """
+        if max_workers < 1:
+            raise Exception(f"Wrong parameter value max_workers={max_workers}")
+        if max_download_workers < 1:
+            raise Exception(f"Wrong parameter value max_download_workers={max_download_workers}")
+        if poll_backoff_factor < 1:
+            raise Exception(f"Wrong parameter value poll_backoff_factor={poll_backoff_factor}")
+        self.logger = logging.getLogger(__name__)
+        self._session = session
+        self._url = url
+        self._response_job_id_field_name = response_job_id_field_name
+        self._response_state_field_name = response_state_field_name
+        self._successful_states = successful_states
+        self._waiting_states = waiting_states
+        self._headers = _job_headers(extra_headers)
+        self._initial_poll_seconds = initial_poll_seconds
+        self._max_poll_seconds = max_poll_seconds
+        self._poll_backoff_factor = poll_backoff_factor
+        self._deadline_seconds = deadline_seconds
+        self._max_workers = max_workers
+        self._max_download_workers = max_download_workers
+        self._timeout = timeout
+        self._retry_policy = retry_policy
+        self._rate_limiter = rate_limiter
+        self._executor = None
+        self._download_executor = None
+        self._to_create = []
+        # (time of next poll, sequence number, job)
+        self._schedule = []
+        self._sequence = itertools.count()
+        # future -> job, for requests in flight
+        self._in_flight = {}
+        # future -> job, for downloads in flight
+        self._downloads = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def submit(self, extra_params: dict = {}) -> Job:
+        """
+        Queues a job to be created with `extra_params`. Jobs are created by `as_completed()`.
+        """
+        job = Job(extra_params)
+        self._to_create.append(job)
+        return job
+
+    def as_completed(self, download_func: t.Optional[t.Callable[[Job], t.Any]] = None) -> t.Iterator[Job]:
+        """
+        Creates queued jobs, polls them and yields each job as soon as it's finished. Check `job.error` (or
+        `job.succeeded`) of yielded jobs: failed jobs are yielded as well.
+
+        :param download_func: if given, it's called with each successful job on the download thread pool, and the job
+            is yielded once it returns, with the returned value in `job.result`. Downloads started before
+            the deadline are not interrupted by it.
+        """
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers)
+        if download_func is not None and self._download_executor is None:
+            self._download_executor = concurrent.futures.ThreadPoolExecutor(max_workers=self._max_download_workers)
+        deadline = time.monotonic() + self._deadline_seconds if self._deadline_seconds is not None else None
+
+        while self._to_create or self._schedule or self._in_flight or self._downloads:
+            for job in self._to_create:
+                self._start(self._create, job)
+            self._to_create = []
+
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                yield from self._expire()
+                deadline = None
+                continue
+
+            while self._schedule and self._schedule[0][0] <= now:
+                _, _, job = heapq.heappop(self._schedule)
+                self._start(self._poll, job)
+
+            wait_seconds = self._schedule[0][0] - now if self._schedule else None
+            if deadline is not None:
+                wait_seconds = min(wait_seconds, deadline - now) if wait_seconds is not None else deadline - now
+            if not self._in_flight and not self._downloads:
+                time.sleep(max(wait_seconds, 0))
+                continue
+            done, _ = concurrent.futures.wait([*self._in_flight, *self._downloads], timeout=wait_seconds,
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future in self._downloads:
+                    job = self._downloads.pop(future)
+                    try:
+                        job.result = future.result()
+                    except Exception as e:
+                        job.error = e
+                    yield job
+                    continue
+                job = self._in_flight.pop(future)
+                if not self._handle_result(job, future):
+                    continue
+                if download_func is not None and job.succeeded:
+                    self.logger.debug(f"Downloading results of job {job.job_id}")
+                    self._downloads[self._download_executor.submit(download_func, job)] = job
+                else:
+                    yield job
+
+    def close(self):
+        """
+        Stops polling and waits for downloads in flight. Jobs are not cancelled on the server.
+        """
+        self._cancel_polling()
+        for future in self._downloads:
+            future.cancel()
+        self._downloads = {}
+        for executor in (self._executor, self._download_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._executor = None
+        self._download_executor = None
+
+    def _cancel_polling(self):
+        for future in self._in_flight:
+            future.cancel()
+        self._in_flight = {}
+        self._schedule = []
+
+    def _start(self, func, job: Job):
+        self._in_flight[self._executor.submit(func, job)] = job
+
+    def _create(self, job: Job):
+        return _submit_job(self._session, self._url, self._headers, job.params, self._response_job_id_field_name,
+                           self._timeout, self._retry_policy, self._rate_limiter)
+
+    def _poll(self, job: Job):
+        return _poll_job(self._session, self._url, job.job_id, self._headers, self._response_state_field_name,
+                         self._timeout, self._retry_policy, self._rate_limiter)
+
+    def _schedule_poll(self, job: Job):
+        heapq.heappush(self._schedule, (time.monotonic() + job.poll_seconds, next(self._sequence), job))
+
+    def _handle_result(self, job: Job, future) -> bool:
+        """
+        Updates the job with the result of its request. Returns True if the job is finished.
+        """
+        try:
+            result = future.result()
+        except Exception as e:
+            job.error = e
+            return True
+
+        if job.job_id is None:
+            job.job_id = result
+            job.poll_seconds = self._initial_poll_seconds
+            self.logger.debug(f"Created job {job.job_id}")
+            self._schedule_poll(job)
+            return False
+
+        job.state, job.response_json = result
+        job.polls += 1
+        if job.state in self._waiting_states:
+            job.poll_seconds = min(job.poll_seconds * self._poll_backoff_factor, self._max_poll_seconds)
+            self._schedule_poll(job)
+            return False
+        if job.state not in self._successful_states:
+            job.error = Exception(f"Job failed with state {job.state}. Response {job.response_json}")
+        return True
+
+    def _expire(self) -> t.Iterator[Job]:
+        jobs = list(self._in_flight.values()) + [job for _, _, job in self._schedule]
+        self._cancel_polling()
+        for job in jobs:
+            job.error = Exception(f"Job {job.job_id} not finished before deadline. Last state {job.state}")
+            yield job
@@ -1,11 +1,17 @@
 import logging
 import math
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
+from .CheckpointingIterator import CheckpointingIterator
 from .dict_utils import *
+from .http_utils import send_request
+from .RecordIterator import RecordIterator
+from .streaming_json import StreamedPage
 
 
-class PaginatedApiIterator:
+class PaginatedApiIterator(CheckpointingIterator):
 
     def __init__(self,
                  session: requests.Session,
@@ -22,8 +28,32 @@ class PaginatedApiIterator:
                  start_page_number_from_1=True,
                  http_method="GET",
                  request_page_number_location: str = "params",
-                 timeout=(10, 60)
+                 timeout=(10, 60),
+                 max_workers: Optional[int] = None,
+                 preserve_order: bool = True,
+                 stream_records: bool = False,
+                 retry_policy=None,
+                 rate_limiter=None,
+                 checkpoint_handler=None,
+                 checkpoint_every_n_pages: int = 1,
                  ):
+        """
+
+        :param max_workers: if greater than 1, then after the first page is downloaded (and page count is known),
+            the remaining pages are fetched concurrently on a thread pool of that size. At most `2 * max_workers`
+            pages are kept in flight, so memory stays bounded.
+        :param preserve_order: used only with `max_workers`. If False, pages are returned as soon as they are
+            downloaded, which may differ from page order.
+        :param stream_records: if True, each page is returned as an iterator of records decoded incrementally from
+            the response stream, so a whole page is never held in memory. Requires `ijson` package. A page must be
+            consumed (or abandoned) before the next one is requested. Can't be used with `max_workers`.
+        :param retry_policy: optional `RetryPolicy` for retrying failed requests.
+        :param rate_limiter: optional `RateLimiter`, which may be shared with other iterators.
+        :param checkpoint_handler: a function that is called with `state()` every `checkpoint_every_n_pages` pages
+            (and after the last page), once the consumer has processed them. Store it somewhere and pass it to
+            `from_state()` to resume an interrupted download.
+        :param checkpoint_every_n_pages: see `checkpoint_handler`.
+        """
         self.logger = logging.getLogger(__name__)
         self._session = session
         self._timeout = timeout
@@ -41,6 +71,10 @@ class PaginatedApiIterator:
         self._records_per_page = records_per_page
 
         self._response_records_field_name = response_records_field_name
+        # paths are parsed once, page count (or record count) and records are taken in one traversal of a response
+        self._count_path = DictPath(response_page_count_field_name or response_record_count_field_name)
+        self._response_paths = DictPaths(self._count_path, DictPath(response_records_field_name))
+        self._page_number_data_path = DictPath(request_page_number_param_name)
         self._extra_params = extra_params
         if extra_headers:
             self._request_headers = {
@@ -55,18 +89,144 @@ class PaginatedApiIterator:
             }
         self._extra_data_fields = extra_data_fields
         self._start_page_number_from_1 = start_page_number_from_1
+        if max_workers is not None and max_workers < 1:
+            raise Exception(f"Wrong parameter value max_workers={max_workers}")
+        self._max_workers = max_workers
+        self._preserve_order = preserve_order
+        if stream_records and max_workers is not None and max_workers > 1:
+            raise Exception("stream_records can't be used together with max_workers.")
+        self._stream_records = stream_records
+        self._streamed_page = None
+        self._retry_policy = retry_policy
+        self._rate_limiter = rate_limiter
+        self._executor = None
+        self._pending = deque()
+        self._next_page_to_submit = None
+        self._last_page_number = None
+        self._init_checkpointing(checkpoint_handler, checkpoint_every_n_pages)
         self.page_number = 1 if self._start_page_number_from_1 else 0
         self._completed = False
+
     def __iter__(self):
         self.logger.debug(f"Downloading from {self._url}")
-        self.page_number = 1 if self._start_page_number_from_1 else 0
-        self._completed = False
+        self.close()
+        self._reset_position(self._initial_state())
         return self
 
     def __next__(self):
+        if self._stream_records:
+            return self._next_streamed()
+
+        self._checkpoint(force=self._completed)
+        if self._completed:
+            raise StopIteration
+
+        if self._executor is not None:
+            return self._next_concurrent()
+
+        records, page_count = self._fetch_page(self.page_number)
+
+        self.page_number += 1
+
+        self._last_page_number = page_count if self._start_page_number_from_1 else page_count - 1
+        if self.page_number > self._last_page_number:
+            self._completed = True
+        elif self._max_workers is not None and self._max_workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+            self._next_page_to_submit = self.page_number
+            self._submit_pages()
+
+        self._page_returned()
+        return records
+
+    def state(self) -> dict:
+        """
+        Returns position of the iterator: the page that will be returned next.
+        """
+        if self._max_workers is not None and self._max_workers > 1 and not self._preserve_order:
+            raise Exception("state() is not supported with preserve_order=False.")
+        return {"page_number": self.page_number, "completed": self._completed}
+
+    def _initial_state(self):
+        return {"page_number": 1 if self._start_page_number_from_1 else 0, "completed": False}
+
+    def _apply_state(self, state: dict):
+        self.page_number = state["page_number"]
+        self._completed = state["completed"]
+
+    def records(self) -> RecordIterator:
+        """
+        Returns an iterator over single records of all pages.
+        """
+        return RecordIterator(self)
+
+    def close(self):
+        """
+        Stops fetching pages in background (when `max_workers` is set) and closes the streamed page.
+        """
+        self._completed = True
+        self._shutdown_executor()
+        if self._streamed_page is not None:
+            self._streamed_page.close()
+            self._streamed_page = None
+
+    def _submit_pages(self):
+        while len(self._pending) < 2 * self._max_workers and self._next_page_to_submit <= self._last_page_number:
+            self._pending.append(self._executor.submit(self._fetch_page, self._next_page_to_submit))
+            self._next_page_to_submit += 1
+
+    def _next_concurrent(self):
+        if self._preserve_order:
+            future = self._pending.popleft()
+        else:
+            done, _ = wait(self._pending, return_when=FIRST_COMPLETED)
+            future = done.pop()
+            self._pending.remove(future)
+
+        try:
+            records, _ = future.result()
+        except BaseException:
+            self.close()
+            raise
+
+        self.page_number += 1
+        self._submit_pages()
+        if not self._pending:
+            self._completed = True
+            self._shutdown_executor()
+        self._page_returned()
+        return records
+
+    def _next_streamed(self):
+        if self._streamed_page is not None:
+            page_count = self._page_count(self._streamed_page.drain())
+            self.logger.debug(f"Downloaded page {self.page_number - 1} out of {page_count}. Items collected: {self._streamed_page.records_count}")
+            self._streamed_page = None
+            self._last_page_number = page_count if self._start_page_number_from_1 else page_count - 1
+            if self.page_number > self._last_page_number:
+                self._completed = True
+
+        self._checkpoint(force=self._completed)
         if self._completed:
             raise StopIteration
 
+        request_params, request_data = self._build_request(self.page_number)
+        response = self._send_request(request_params, request_data, stream=True)
+        self._streamed_page = StreamedPage(response, self._response_records_field_name)
+        self.page_number += 1
+        self._page_returned()
+
+        return self._streamed_page
+
+    def _shutdown_executor(self):
+        if self._executor is not None:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._pending = deque()
+
+    def _build_request(self, page_number):
         request_params = None
         if self._extra_params is not None:
             request_params = self._extra_params.copy()
@@ -78,33 +238,43 @@ class PaginatedApiIterator:
         if self._request_page_number_location == "params":
             if request_params is None:
                 request_params = {}
-            request_params[self._request_page_number_param_name] = self.page_number
+            request_params[self._request_page_number_param_name] = page_number
         elif self._request_page_number_location == "data":
             if request_data is None:
                 request_data = {}
-            dict_set(request_data, self._request_page_number_param_name, self.page_number)
+            self._page_number_data_path.set(request_data, page_number)
         else:
             raise Exception(f"Wrong parameter value request_page_number_location={self._request_page_number_location}")
 
-        response = self._session.request(method=self._http_method, url=self._url, headers=self._request_headers,
-                                         params=request_params, json=request_data, timeout=self._timeout)
-        response.raise_for_status()
+        return request_params, request_data
 
-        response_json = response.json()
-        if self._response_page_count_field_name is not None:
-            page_count = dict_get(response_json, self._response_page_count_field_name)
-        else:
-            records_count = dict_get(response_json, self._response_record_count_field_name)
-            page_count = math.ceil(records_count/self._records_per_page)
+    def _fetch_page(self, page_number):
+        request_params, request_data = self._build_request(page_number)
 
-        records = dict_get(response_json, self._response_records_field_name, [])
+        response = self._send_request(request_params, request_data)
 
-        self.logger.debug(f"Downloaded page {self.page_number} out of {page_count}. Items collected: {len(records)}")
+        return self._parse_response(response.json(), page_number)
 
-        self.page_number += 1
+    def _send_request(self, request_params, request_data, stream=False):
+        return send_request(self._session, self._http_method, self._url, retry_policy=self._retry_policy,
+                            rate_limiter=self._rate_limiter, headers=self._request_headers, params=request_params,
+                            json=request_data, timeout=self._timeout, stream=stream)
 
-        if (self._start_page_number_from_1 and self.page_number > page_count) or \
-                (not self._start_page_number_from_1 and self.page_number >= page_count):
-            self._completed = True
+    def _page_count(self, response_json):
+        return self._to_page_count(self._count_path.get(response_json))
 
-        return records
+    def _to_page_count(self, count):
+        if self._response_page_count_field_name is not None:
+            return count
+        else:
+            return math.ceil(count/self._records_per_page)
+
+    def _parse_response(self, response_json, page_number):
+        count, records = self._response_paths.get(response_json)
+        page_count = self._to_page_count(count)
+        if records is None:
+            records = []
+
+        self.logger.debug(f"Downloaded page {page_number} out of {page_count}. Items collected: {len(records)}")
+
+        return records, page_count
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import time
+import typing as t
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: t.Optional[float] = None):
+        """
+        Token bucket limiting the number of requests per second. A single instance can be shared by any number of
+        iterators and `prepare_job` calls, from many threads and from asyncio tasks.
+
+        Callers that exceed the rate reserve tokens in advance and then wait for them, so they are served in order
+        of arrival and the throughput stays at `rate`.
+
+        :param rate: number of requests per second.
+        :param burst: bucket capacity, i.e. how many requests may be sent at once after a period of inactivity.
+            Defaults to `rate` (but at least 1).
+        """
+        if rate <= 0:
+            raise Exception(f"Wrong parameter value rate={rate}")
+        self._rate = rate
+        self._capacity = burst if burst is not None else max(1.0, rate)
+        if self._capacity < 1:
+            raise Exception(f"Wrong parameter value burst={burst}")
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.wait_seconds = 0.0
+
+    def _reserve(self, tokens: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            delay = -self._tokens / self._rate
+            self.wait_seconds += delay
+            return delay
+
+    def acquire(self, tokens: float = 1):
+        """
+        Blocks until `tokens` requests can be sent.
+        """
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def async_acquire(self, tokens: float = 1):
+        """
+        Waits (without blocking the event loop) until `tokens` requests can be sent.
+        """
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
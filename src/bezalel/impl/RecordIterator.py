@@ -0,0 +1,63 @@
+_END = object()
+
+
+class RecordIterator:
+    """
+    Iterates over records of all pages returned by `pages` (i.e. `PaginatedApiIterator` or `CursorApiIterator`),
+    one record at a time. Only the current page is referenced, so memory doesn't grow with the number of pages.
+
+    `records_count` and `pages_count` tell how many records and pages were seen so far.
+    """
+    def __init__(self, pages):
+        self._pages = pages
+        self._page_iterator = None
+        self._records = None
+        self.records_count = 0
+        self.pages_count = 0
+
+    def __iter__(self):
+        self._page_iterator = iter(self._pages)
+        self._records = None
+        self.records_count = 0
+        self.pages_count = 0
+        return self
+
+    def __next__(self):
+        if self._page_iterator is None:
+            self._page_iterator = iter(self._pages)
+        while True:
+            if self._records is not None:
+                record = next(self._records, _END)
+                if record is not _END:
+                    self.records_count += 1
+                    return record
+                self._records = None
+            page = next(self._page_iterator)
+            self.pages_count += 1
+            self._records = iter(page)
+
+
+class AsyncRecordIterator(RecordIterator):
+    """
+    `async for` counterpart of `RecordIterator`, for `AsyncPaginatedApiIterator` and `AsyncCursorApiIterator`.
+    """
+    def __aiter__(self):
+        self._page_iterator = self._pages.__aiter__()
+        self._records = None
+        self.records_count = 0
+        self.pages_count = 0
+        return self
+
+    async def __anext__(self):
+        if self._page_iterator is None:
+            self._page_iterator = self._pages.__aiter__()
+        while True:
+            if self._records is not None:
+                record = next(self._records, _END)
+                if record is not _END:
+                    self.records_count += 1
+                    return record
+                self._records = None
+            page = await self._page_iterator.__anext__()
+            self.pages_count += 1
+            self._records = iter(page)
@@ -0,0 +1,171 @@
+import asyncio
+import email.utils
+import random
+import threading
+import time
+import typing as t
+
+import requests
+
+
+class RetryStats:
+    """
+    Statistics of requests sent with a `RetryPolicy`. Safe to update from many threads.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.backoff_seconds = 0.0
+        self.retried_statuses = {}
+        self.retried_exceptions = {}
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_retry(self, delay: float, status: t.Optional[int] = None, exception: t.Optional[BaseException] = None):
+        with self._lock:
+            self.retries += 1
+            self.backoff_seconds += delay
+            if status is not None:
+                self.retried_statuses[status] = self.retried_statuses.get(status, 0) + 1
+            if exception is not None:
+                name = type(exception).__name__
+                self.retried_exceptions[name] = self.retried_exceptions.get(name, 0) + 1
+
+    def __repr__(self):
+        return f"RetryStats(requests={self.requests}, retries={self.retries}, " \
+               f"backoff_seconds={self.backoff_seconds:.3f}, retried_statuses={self.retried_statuses}, " \
+               f"retried_exceptions={self.retried_exceptions})"
+
+
+class RetryPolicy:
+    def __init__(self,
+                 max_retries: int = 5,
+                 backoff_factor: float = 0.5,
+                 max_backoff_seconds: float = 60.0,
+                 jitter: bool = True,
+                 retry_statuses: t.Collection[int] = (429, 500, 502, 503, 504),
+                 retry_exceptions: t.Tuple[t.Type[BaseException], ...] = (requests.ConnectionError, requests.Timeout),
+                 respect_retry_after: bool = True):
+        """
+        Retry policy for HTTP requests, shared by `PaginatedApiIterator`, `CursorApiIterator` and `prepare_job`.
+
+        Delay before retry number `n` (counting from 0) is `backoff_factor * 2 ** n` seconds, capped by
+        `max_backoff_seconds`. With `jitter` a random delay between 0 and that value is used instead.
+
+        :param max_retries: how many times a request is retried before giving up.
+        :param backoff_factor: base delay in seconds.
+        :param max_backoff_seconds: upper limit of computed delay (doesn't apply to Retry-After).
+        :param jitter: randomize delays, so that many clients don't retry at the same moment.
+        :param retry_statuses: HTTP statuses that are retried.
+        :param retry_exceptions: exception types that are retried. For async clients pass their own exceptions,
+            i.e. `(httpx.TransportError,)`.
+        :param respect_retry_after: if response has `Retry-After` header, wait as long as it says.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff_seconds = max_backoff_seconds
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.respect_retry_after = respect_retry_after
+        self.stats = RetryStats()
+
+    def reset_stats(self):
+        self.stats = RetryStats()
+
+    def retry_delay(self, attempt: int, response=None, exception: t.Optional[BaseException] = None) -> t.Optional[float]:
+        """
+        Returns delay in seconds before next attempt, or None if request must not be retried.
+
+        :param attempt: number of retries done so far.
+        :param response: response received (if any).
+        :param exception: exception raised while sending request (if any).
+        """
+        if attempt >= self.max_retries:
+            return None
+        if exception is not None:
+            if not isinstance(exception, self.retry_exceptions):
+                return None
+        elif _status_of(response) not in self.retry_statuses:
+            return None
+
+        if response is not None and self.respect_retry_after:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after
+
+        delay = min(self.backoff_factor * 2 ** attempt, self.max_backoff_seconds)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def send(self, send_func: t.Callable[[], t.Any]):
+        """
+        Calls `send_func()` (which sends one request and returns response) until response is not retryable.
+        """
+        attempt = 0
+        while True:
+            self.stats.record_request()
+            try:
+                response = send_func()
+            except Exception as e:
+                delay = self.retry_delay(attempt, exception=e)
+                if delay is None:
+                    raise
+                self.stats.record_retry(delay, exception=e)
+            else:
+                delay = self.retry_delay(attempt, response=response)
+                if delay is None:
+                    return response
+                self.stats.record_retry(delay, status=_status_of(response))
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    async def async_send(self, send_func: t.Callable[[], t.Awaitable[t.Any]]):
+        """
+        Async counterpart of `send()`.
+        """
+        attempt = 0
+        while True:
+            self.stats.record_request()
+            try:
+                response = await send_func()
+            except Exception as e:
+                delay = self.retry_delay(attempt, exception=e)
+                if delay is None:
+                    raise
+                self.stats.record_retry(delay, exception=e)
+            else:
+                delay = self.retry_delay(attempt, response=response)
+                if delay is None:
+                    return response
+                self.stats.record_retry(delay, status=_status_of(response))
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def _status_of(response) -> int:
+    # requests and httpx use status_code, aiohttp uses status
+    status = getattr(response, "status_code", None)
+    if status is None:
+        status = getattr(response, "status", None)
+    return status
+
+
+def _parse_retry_after(value: t.Optional[str]) -> t.Optional[float]:
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
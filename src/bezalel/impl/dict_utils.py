@@ -1,33 +1,165 @@
+import functools
+import re
 from typing import Optional
 
 
+_INDEX_RE = re.compile(r"^(.*?)((?:\[-?\d+\])+)$")
+
+
+@functools.lru_cache(maxsize=1024)
+def _split_path(path: str, path_split_char: str) -> tuple:
+    return tuple(path.split(path_split_char))
+
+
 def dict_get(d: dict, path: str, default: any = None, path_split_char: str = ".") -> any:
-    elems = path.split(path_split_char)
     q = d
-    for e in elems:
+    for e in _split_path(path, path_split_char):
         if not isinstance(q, dict):
             return default
-        if e in q.keys():
-            q = q.get(e)
+        if e in q:
+            q = q[e]
         else:
             return default
     return q
 
 
 def dict_set(d: dict, path: str, val: any, path_split_char: str = "."):
-    elems = path.split(path_split_char)
+    elems = _split_path(path, path_split_char)
 
     q = d
     for e in elems[:-1]:
-        if e in q.keys():
-            if isinstance(q.get(e), dict):
-                q = q.get(e)
+        if e in q:
+            if isinstance(q[e], dict):
+                q = q[e]
             else:
                 q[e] = {}
-                q = q.get(e)
+                q = q[e]
         else:
             q[e] = {}
             q = q[e]
     k = elems[-1]
     q[k] = val
 
+
+def _parse_path(path: str, path_split_char: str) -> tuple:
+    """
+    Splits `path` into dict keys (str) and list indices (int). The separator and `\\` can be escaped with `\\`.
+    """
+    parts = []
+    segment = []
+    escaped = []  # escaped characters of the current segment can't form an index
+    chars = iter(path)
+    for c in chars:
+        if c == "\\":
+            nxt = next(chars, None)
+            if nxt is None:
+                raise Exception(f"Wrong path '{path}': trailing escape character")
+            escaped.append(len(segment))
+            segment.append(nxt)
+        elif c == path_split_char:
+            parts.extend(_parse_segment("".join(segment), escaped))
+            segment, escaped = [], []
+        else:
+            segment.append(c)
+    parts.extend(_parse_segment("".join(segment), escaped))
+    return tuple(parts)
+
+
+def _parse_segment(segment: str, escaped: list) -> list:
+    match = _INDEX_RE.match(segment)
+    if match is None or (escaped and escaped[-1] >= len(match.group(1))):
+        return [segment]
+    key, indices = match.groups()
+    parts = [key] if key else []
+    parts.extend(int(i) for i in indices[1:-1].split("]["))
+    return parts
+
+
+def _get_part(q: any, part, missing: any) -> any:
+    if isinstance(part, int):
+        if isinstance(q, list) and -len(q) <= part < len(q):
+            return q[part]
+        return missing
+    if isinstance(q, dict) and part in q:
+        return q[part]
+    return missing
+
+
+_MISSING = object()
+
+
+class DictPath:
+    """
+    A path into nested dicts (and lists), parsed once and reused, i.e. `DictPath("result.entities")`.
+
+    Parts are separated by `path_split_char`. A part may end with list indices, i.e. `"data.items[0].id"`.
+    To use the separator, `\\` or `[` literally in a key, escape it with `\\`, i.e. `"a\\.b"` is a single key "a.b".
+    """
+    def __init__(self, path: str, path_split_char: str = "."):
+        self.path = path
+        self.parts = _parse_path(path, path_split_char)
+
+    def __repr__(self):
+        return f"DictPath({self.path!r})"
+
+    def get(self, d: dict, default: any = None) -> any:
+        """
+        Same as `dict_get()`: returns `default` if any part of the path is missing.
+        """
+        q = d
+        for part in self.parts:
+            q = _get_part(q, part, _MISSING)
+            if q is _MISSING:
+                return default
+        return q
+
+    def set(self, d: dict, val: any):
+        """
+        Same as `dict_set()`: missing (or non-dict) intermediate values are replaced with dicts.
+        List indices must point to existing list elements.
+        """
+        q = d
+        parts = self.parts
+        for part, next_part in zip(parts, parts[1:]):
+            if isinstance(part, int):
+                q = q[part]
+                continue
+            nxt = q.get(part)
+            expected_type = list if isinstance(next_part, int) else dict
+            if not isinstance(nxt, expected_type):
+                if expected_type is list:
+                    raise Exception(f"Failed to set '{self.path}': '{part}' is not a list")
+                nxt = q[part] = {}
+            q = nxt
+        q[parts[-1]] = val
+
+
+class DictPaths:
+    """
+    Several `DictPath`s, whose values are taken from a dict in a single traversal: common prefixes of the paths
+    are visited only once. `DictPaths("pageCount", "result.entities", "result.total").get(d)` returns a tuple
+    of 3 values.
+    """
+    def __init__(self, *paths, path_split_char: str = "."):
+        self.paths = tuple(p if isinstance(p, DictPath) else DictPath(p, path_split_char) for p in paths)
+        # trie of path parts; each node is (children: dict, indices of paths ending at the node: list)
+        self._root = ({}, [])
+        for idx, path in enumerate(self.paths):
+            node = self._root
+            for part in path.parts:
+                node = node[0].setdefault(part, ({}, []))
+            node[1].append(idx)
+
+    def get(self, d: dict, default: any = None) -> tuple:
+        values = [default] * len(self.paths)
+        self._collect(self._root, d, values)
+        return tuple(values)
+
+    def _collect(self, node, q, values: list):
+        children, ends = node
+        for idx in ends:
+            values[idx] = q
+        for part, child in children.items():
+            value = _get_part(q, part, _MISSING)
+            if value is not _MISSING:
+                self._collect(child, value, values)
@@ -0,0 +1,58 @@
+import inspect
+
+import requests
+
+
+def send_request(session: requests.Session, method: str, url: str, retry_policy=None, rate_limiter=None,
+                 raise_for_status: bool = True, **kwargs) -> requests.Response:
+    """
+    Sends request with `session.request(method, url, **kwargs)`, retrying it according to `retry_policy`.
+
+    :param retry_policy: optional `RetryPolicy`.
+    :param rate_limiter: optional `RateLimiter`, acquired before every attempt.
+    :param raise_for_status: call `response.raise_for_status()` on the final response.
+    """
+    def send():
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        return session.request(method=method, url=url, **kwargs)
+
+    if retry_policy is not None:
+        response = retry_policy.send(send)
+    else:
+        response = send()
+    if raise_for_status:
+        response.raise_for_status()
+    return response
+
+
+async def async_request_json(client, method: str, url: str, headers: dict, params: dict, json: dict, timeout,
+                             retry_policy=None, rate_limiter=None):
+    """
+    Sends request with an async HTTP client and returns decoded JSON payload.
+
+    `client` must provide `await client.request(method, url, headers=..., params=..., json=..., timeout=...)`
+    returning a response with `raise_for_status()` and `json()` (which may be a coroutine). That matches
+    `httpx.AsyncClient` and `aiohttp.ClientSession`.
+    """
+    if params is not None:
+        # requests silently drops params with None value, async clients don't
+        params = {k: v for k, v in params.items() if v is not None}
+    kwargs = {"headers": headers, "params": params, "json": json}
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+
+    async def send():
+        if rate_limiter is not None:
+            await rate_limiter.async_acquire()
+        return await client.request(method, url, **kwargs)
+
+    if retry_policy is not None:
+        response = await retry_policy.async_send(send)
+    else:
+        response = await send()
+    response.raise_for_status()
+    response_json = response.json()
+    if inspect.isawaitable(response_json):
+        response_json = await response_json
+    return response_json
@@ -1,8 +1,34 @@
 import json
+from collections import ChainMap
+
+# key to skip while unrolling a record, when there is no path to follow
+_NO_KEY = object()
+
+
+class ShapeCache:
+    """
+    Cache of record layouts for `normalize_dicts()` and `iter_normalize_dicts()`.
+
+    For each distinct shape of a (nested) record, i.e. its keys in order, the flattened field names are computed only
+    once. Records from one endpoint usually have few shapes, so other records of the same shape are unrolled without
+    building names again. At most `max_shapes` shapes are kept per settings (`separator`, `jsonify_dicts`), records of
+    other shapes are unrolled without the cache.
+
+    A cache may be reused between calls, i.e. for all pages from one endpoint.
+    """
+    def __init__(self, max_shapes: int = 1024):
+        self.max_shapes = max_shapes
+        self._layouts = {}
+
+    def __len__(self):
+        return sum(len(layouts) for layouts in self._layouts.values())
+
+    def _layouts_for(self, separator: str, jsonify_dicts: frozenset) -> dict:
+        return self._layouts.setdefault((separator, jsonify_dicts), {})
 
 
 def normalize_dicts(records_list: list, path: list, separator=".", return_incomplete_records=True, jsonify_lists=False,
-                    jsonify_dicts: list=[]):
+                    jsonify_dicts: list=[], share_prefix=False, shape_cache=None):
     """
     Normalize list of nested python dicts to a list of one-level dicts.
 
@@ -45,14 +71,37 @@ def normalize_dicts(records_list: list, path: list, separator=".", return_incomp
         at some level, this flag indicates if that incomplete record should be returned in result list.
     :param jsonify_dicts: list (defaults to []) a list of paths (str) that point to dicts in each record that must not
         be recurred into during unrolling.
+    :param share_prefix: bool (defaults to False), if True, then `collections.ChainMap` objects are returned instead of
+        dicts. Fields of a parent record are not copied into each row below it, but shared between those rows, which
+        saves time and memory for deep and wide records. Don't modify returned rows then.
+    :param shape_cache: `ShapeCache` or True (defaults to None), if given, flattened field names are computed once
+        per shape of records, not for every record. True creates a new cache for this call only, pass a `ShapeCache`
+        to reuse it between calls.
     :return: list of normalized dicts.
     """
+    return list(iter_normalize_dicts(records_list, path, separator=separator,
+                                     return_incomplete_records=return_incomplete_records,
+                                     jsonify_lists=jsonify_lists, jsonify_dicts=jsonify_dicts,
+                                     share_prefix=share_prefix, shape_cache=shape_cache))
+
+
+def iter_normalize_dicts(records_list: list, path: list, separator=".", return_incomplete_records=True,
+                         jsonify_lists=False, jsonify_dicts: list=[], share_prefix=False, shape_cache=None):
+    """
+    Same as `normalize_dicts()`, but yields normalized dicts one by one, so the result of unrolling along `path`
+    is never held in memory at once. Parameters are the same as in `normalize_dicts()`.
+    """
+    jsonify_dicts = frozenset(jsonify_dicts) if jsonify_dicts else frozenset()
+    if shape_cache is True:
+        shape_cache = ShapeCache()
+    layouts = shape_cache._layouts_for(separator, jsonify_dicts) if shape_cache is not None else None
+
     def unroll_dict_rec(d: dict, prefix: str = "") -> dict:
         unrolled = {}
         for k, v in d.items():
             unrolled_key = f"{prefix}{k}"
 
-            if type(v) == dict and jsonify_dicts is not None and unrolled_key in jsonify_dicts:
+            if type(v) == dict and unrolled_key in jsonify_dicts:
                 unrolled[unrolled_key] = json.dumps(v)
             elif type(v) == dict:
                 for u_k, u_v in unroll_dict_rec(v, f"{unrolled_key}{separator}").items():
@@ -63,26 +112,120 @@ def normalize_dicts(records_list: list, path: list, separator=".", return_incomp
                 unrolled[unrolled_key] = v
         return unrolled
 
-    def normalize_dicts_rec(records_list: list, path: list, prefix: str = "") -> list:
+    def unroll_dict_cached(d: dict, prefix: str = "", skip_key=_NO_KEY) -> dict:
+        # same as unroll_dict_rec(), but for each shape of `d` layout of (key, unrolled key, is key in jsonify_dicts,
+        # prefix for a nested dict) is computed only once
+        keys = tuple(d)
+        layout = layouts.get((prefix, skip_key, keys))
+        if layout is None:
+            if len(layouts) >= shape_cache.max_shapes:
+                return unroll_dict_rec({k: d[k] for k in keys if k != skip_key}, prefix)
+            layout = tuple((k, f"{prefix}{k}", f"{prefix}{k}" in jsonify_dicts, f"{prefix}{k}{separator}")
+                           for k in keys if k != skip_key)
+            layouts[(prefix, skip_key, keys)] = layout
+        unrolled = {}
+        for k, unrolled_key, is_jsonify_dict, child_prefix in layout:
+            v = d[k]
+            if type(v) == dict:
+                if is_jsonify_dict:
+                    unrolled[unrolled_key] = json.dumps(v)
+                else:
+                    unrolled.update(unroll_dict_cached(v, child_prefix))
+            elif jsonify_lists and type(v) == list:
+                unrolled[unrolled_key] = json.dumps(v)
+            else:
+                unrolled[unrolled_key] = v
+        return unrolled
+
+    def iter_normalize_dicts_rec(records_list: list, path: list, prefix: str = "", parent_row: dict = None,
+                                 parent_maps: tuple = ()):
+        # fields of parent records are merged top-down, so each parent is copied once per child record,
+        # not once per level of every row below it. With share_prefix they are not copied at all,
+        # parent_maps holds unrolled parents, the nearest one first.
         if records_list is None or len(records_list) == 0:
             records_list = [{}] if return_incomplete_records else []
         if type(records_list) != list:
             raise Exception(f"records_list is not a list at [{prefix}]")
-        records_denormalized = []
         for record in records_list:
             if type(record) != dict:
                 raise Exception(f"record is not a dict at [{prefix}]")
-            keys_to_repeat = list(record.keys())
-            if len(path) > 0 and path[0] in keys_to_repeat:
-                keys_to_repeat.remove(path[0])
-            obj_to_repeat = unroll_dict_rec({k: record[k] for k in keys_to_repeat}, prefix)
+            if layouts is not None:
+                obj_to_repeat = unroll_dict_cached(record, prefix, path[0] if len(path) > 0 else _NO_KEY)
+            else:
+                keys_to_repeat = list(record.keys())
+                if len(path) > 0 and path[0] in keys_to_repeat:
+                    keys_to_repeat.remove(path[0])
+                obj_to_repeat = unroll_dict_rec({k: record[k] for k in keys_to_repeat}, prefix)
+            if share_prefix:
+                row = None
+                maps = (obj_to_repeat,) + parent_maps
+            else:
+                row = {**parent_row, **obj_to_repeat} if parent_row is not None else obj_to_repeat
+                maps = ()
             if len(path) > 0:
-                records2 = normalize_dicts_rec(record.get(path[0]), path[1:], prefix=f"{prefix}{path[0]}{separator}")
-                for rec2 in records2:
-                    records_denormalized.append({**obj_to_repeat, **rec2})
+                yield from iter_normalize_dicts_rec(record.get(path[0]), path[1:], prefix=f"{prefix}{path[0]}{separator}",
+                                                    parent_row=row, parent_maps=maps)
+            elif share_prefix:
+                yield ChainMap(*maps)
             else:
-                records_denormalized.append(obj_to_repeat)
-        return records_denormalized
+                yield row
     if len(records_list) == 0:
-        return []
-    return normalize_dicts_rec(records_list, path)
+        return
+    yield from iter_normalize_dicts_rec(records_list, path)
+
+
+class ColumnarResult:
+    """
+    Result of `normalize_dicts_columnar()`.
+
+    - `schema`: list of column names (flattened keys), in order of first appearance
+    - `columns`: dict mapping column name to list of values, all lists have `row_count` elements
+    - `row_count`: number of rows
+    """
+    def __init__(self, schema: list, columns: dict, row_count: int):
+        self.schema = schema
+        self.columns = columns
+        self.row_count = row_count
+
+    def __len__(self):
+        return self.row_count
+
+    def to_rows(self) -> list:
+        """
+        Returns list of dicts with all columns (missing values filled in).
+        """
+        return [dict(zip(self.schema, values)) for values in zip(*(self.columns[c] for c in self.schema))]
+
+
+def normalize_dicts_columnar(records_list: list, path: list, separator=".", return_incomplete_records=True,
+                             jsonify_lists=False, jsonify_dicts: list=[], fill_value=None,
+                             shape_cache=None) -> ColumnarResult:
+    """
+    Same as `normalize_dicts()`, but returns columns instead of rows: a list of values per flattened key.
+    Columns are filled while unrolling, no per-row dicts are built.
+
+    :param fill_value: value used where a row doesn't have a key, that other rows have (defaults to None).
+    :return: ColumnarResult. See `normalize_dicts()` for other parameters.
+    """
+    columns = {}
+    row_count = 0
+    for row in iter_normalize_dicts(records_list, path, separator=separator,
+                                    return_incomplete_records=return_incomplete_records,
+                                    jsonify_lists=jsonify_lists, jsonify_dicts=jsonify_dicts, share_prefix=True,
+                                    shape_cache=shape_cache):
+        # from the top level parent down, so values of nested records win, like in normalize_dicts()
+        for unrolled in reversed(row.maps):
+            for k, v in unrolled.items():
+                column = columns.get(k)
+                if column is None:
+                    column = columns[k] = [fill_value] * row_count
+                    column.append(v)
+                elif len(column) == row_count:
+                    column.append(v)
+                else:
+                    column[row_count] = v
+        row_count += 1
+        for column in columns.values():
+            if len(column) < row_count:
+                column.append(fill_value)
+    return ColumnarResult(list(columns.keys()), columns, row_count)
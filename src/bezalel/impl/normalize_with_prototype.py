@@ -7,12 +7,407 @@ class NormalizeException(Exception):
         self._path = path
         self._message = message
 
+    def __reduce__(self):
+        # so that errors raised in worker processes can be re-raised in the parent
+        return self.__class__, (self._path, self._message)
+
+
+def _default_type_converter(prototype_object, object_to_norm, path_info):
+    return object_to_norm
+
+
+# marks position of a list index in a compiled path
+_INDEX = object()
+
+
+def _format_path(path_parts: tuple, indices: tuple) -> str:
+    """
+    Builds `path_info`, i.e. ".pets[1].name", from static parts of a path and list indices collected at runtime.
+    """
+    indices = iter(indices)
+    return "".join(f"[{next(indices)}]" if part is _INDEX else part for part in path_parts)
+
+
+def _pass_through(object_to_norm, indices):
+    return object_to_norm
+
+
+class NormalizeStats:
+    """
+    Counters collected while normalizing with a prototype.
+
+    - `type_conversions`: values whose type didn't match the prototype and were converted (only with strict_types=False)
+    - `nulls_filled`: scalar fields returned as None, because they were missing or null in the object
+    - `freestyle_attrs`: key-value pairs moved to freestyle attributes
+    """
+    def __init__(self):
+        self.type_conversions = 0
+        self.nulls_filled = 0
+        self.freestyle_attrs = 0
+
+    def __repr__(self):
+        return f"NormalizeStats(type_conversions={self.type_conversions}, nulls_filled={self.nulls_filled}, " \
+               f"freestyle_attrs={self.freestyle_attrs})"
+
+
+class CompiledPrototype:
+    """
+    A normalizer built by `compile_prototype()`. Call it with an object to normalize.
+
+    The prototype is walked only once, when compiling. Each node becomes a closure specialised for its type,
+    and path strings for error messages are built only when they are needed.
+
+    If compiled with `collect_stats=True`, `stats` (`NormalizeStats`) accumulates counters of all calls.
+    """
+    def __init__(self, prototype, freestyle_attrs_name="freestyle_attrs", pass_through_paths=[], strict_types=True,
+                 type_converter=None, collect_stats=False):
+        self.stats = NormalizeStats() if collect_stats else None
+        self._freestyle_attrs_name = freestyle_attrs_name
+        self._pass_through_paths = frozenset(pass_through_paths)
+        self._strict_types = strict_types
+        self._type_converter = type_converter if type_converter else _default_type_converter
+        self._normalize = self._compile(prototype, (), "")
+
+    def __call__(self, object_to_norm):
+        return self._normalize(object_to_norm, ())
+
+    def _compile(self, prototype, path_parts: tuple, prototype_path: str):
+        if prototype_path in self._pass_through_paths:
+            return _pass_through
+
+        if isinstance(prototype, dict):
+            return self._compile_dict(prototype, path_parts, prototype_path)
+        elif isinstance(prototype, list):
+            return self._compile_list(prototype, path_parts, prototype_path)
+        elif isinstance(prototype, str):
+            return self._compile_str(prototype, path_parts)
+        elif isinstance(prototype, bool):
+            return self._compile_bool(prototype, path_parts)
+        elif isinstance(prototype, int):
+            return self._compile_int(prototype, path_parts)
+        elif isinstance(prototype, float):
+            return self._compile_float(prototype, path_parts)
+        elif isinstance(prototype, datetime.datetime):
+            # datetime.datetime() is an instance of both datetime.datetime and datetime.date.
+            # datetime.date() is NOT an instance of datetime.datetime
+            # that's why `isinstance(prototype, datetime.datetime)` check comes before `isinstance(prototype, datetime.date)`.
+            return self._compile_datetime(prototype, path_parts)
+        elif isinstance(prototype, datetime.date):
+            return self._compile_date(prototype, path_parts)
+        else:
+            return self._compile_unsupported(prototype, path_parts)
+
+    def _compile_unsupported(self, prototype, path_parts):
+        def normalize_unsupported(object_to_norm, indices):
+            raise NormalizeException(_format_path(path_parts, indices), f"prototype data type not supported: {type(prototype)}")
+        return normalize_unsupported
+
+    def _convert(self, prototype, object_to_norm, path_parts, indices):
+        """
+        Calls type_converter, wrapping its errors into NormalizeException.
+        """
+        try:
+            return self._type_converter(prototype, object_to_norm, _format_path(path_parts, indices))
+        except NormalizeException:
+            raise
+        except Exception as e:
+            raise NormalizeException(_format_path(path_parts, indices), str(e))
+
+    def _compile_dict(self, prototype, path_parts, prototype_path):
+        strict_types = self._strict_types
+        stats = self.stats
+        freestyle_attrs_name = self._freestyle_attrs_name
+        convert = self._convert
+        prototype_keys = frozenset(prototype.keys()) if "" in prototype else None
+        # None as a normalizer marks the freestyle attributes
+        fields = []
+        for k, v in prototype.items():
+            if k == "":
+                fields.append((k, None))
+            elif self._pass_through_paths:
+                fields.append((k, self._compile(v, path_parts + (f".{k}",), f"{prototype_path}.{k}" if prototype_path != "" else k)))
+            else:
+                # prototype paths are needed only to look up pass_through_paths
+                fields.append((k, self._compile(v, path_parts + (f".{k}",), None)))
+
+        def normalize_dict(object_to_norm, indices):
+            if object_to_norm is None:
+                object_to_norm = {}
+            elif not isinstance(object_to_norm, dict) and not strict_types:
+                if stats is not None:
+                    stats.type_conversions += 1
+                object_to_norm = convert(prototype, object_to_norm, path_parts, indices)
+            if not isinstance(object_to_norm, dict):
+                raise NormalizeException(_format_path(path_parts, indices), f"object_to_norm is not dict (of value {object_to_norm})")
+            normalized_object = {}
+            for k, normalize_field in fields:
+                if normalize_field is not None:
+                    normalized_object[k] = normalize_field(object_to_norm.get(k), indices)
+                else:
+                    normalized_object[freestyle_attrs_name] = [
+                        {"key": key, "value": value} for key, value in object_to_norm.items() if key not in prototype_keys or key == ""
+                    ]
+                    if stats is not None:
+                        stats.freestyle_attrs += len(normalized_object[freestyle_attrs_name])
+            return normalized_object
+        return normalize_dict
+
+    def _compile_list(self, prototype, path_parts, prototype_path):
+        strict_types = self._strict_types
+        stats = self.stats
+        convert = self._convert
+        normalize_element = self._compile(prototype[0], path_parts + (_INDEX,), prototype_path) if prototype else None
+
+        def normalize_list(object_to_norm, indices):
+            if object_to_norm is None:
+                object_to_norm = []
+            elif not isinstance(object_to_norm, list) and not strict_types:
+                if stats is not None:
+                    stats.type_conversions += 1
+                object_to_norm = convert(prototype, object_to_norm, path_parts, indices)
+            if not isinstance(object_to_norm, list):
+                raise NormalizeException(_format_path(path_parts, indices), f"object_to_norm is not list (of value {object_to_norm})")
+            if normalize_element is None:
+                if object_to_norm:
+                    raise NormalizeException(_format_path(path_parts, indices), "list index out of range")
+                return []
+            return [normalize_element(e, indices + (idx,)) for idx, e in enumerate(object_to_norm)]
+        return normalize_list
+
+    def _type_mismatch(self, prototype, object_to_norm, path_parts, indices):
+        return NormalizeException(_format_path(path_parts, indices), f"type(prototype) != type(object_to_norm): {type(prototype)} != {type(object_to_norm)} (of value {object_to_norm})")
+
+    def _compile_str(self, prototype, path_parts):
+        strict_types = self._strict_types
+        stats = self.stats
+        convert = self._convert
+        prototype_type = type(prototype)
+
+        def normalize_str(object_to_norm, indices):
+            if object_to_norm is None:
+                if stats is not None:
+                    stats.nulls_filled += 1
+                return None
+            if prototype_type != type(object_to_norm):
+                if strict_types:
+                    raise self._type_mismatch(prototype, object_to_norm, path_parts, indices)
+                if stats is not None:
+                    stats.type_conversions += 1
+                try:
+                    return str(convert(prototype, object_to_norm, path_parts, indices))
+                except NormalizeException:
+                    raise
+                except Exception as e:
+                    raise NormalizeException(_format_path(path_parts, indices), str(e))
+            return object_to_norm
+        return normalize_str
+
+    def _compile_bool(self, prototype, path_parts):
+        strict_types = self._strict_types
+        stats = self.stats
+        convert = self._convert
+        prototype_type = type(prototype)
+
+        def normalize_bool(object_to_norm, indices):
+            if object_to_norm is None:
+                if stats is not None:
+                    stats.nulls_filled += 1
+                return None
+            if prototype_type != type(object_to_norm):
+                if strict_types:
+                    raise self._type_mismatch(prototype, object_to_norm, path_parts, indices)
+                if stats is not None:
+                    stats.type_conversions += 1
+                object_to_norm = convert(prototype, object_to_norm, path_parts, indices)
+                try:
+                    if not isinstance(object_to_norm, bool):
+                        if isinstance(object_to_norm, str):
+                            if object_to_norm.lower().strip() in {'1', 'true', 'yes'}:
+                                object_to_norm = True
+                            elif object_to_norm.lower().strip() in {'0', 'false', 'no'}:
+                                object_to_norm = False
+                            else:
+                                object_to_norm = None
+                        else:
+                            object_to_norm = bool(object_to_norm)
+                except Exception as e:
+                    raise NormalizeException(_format_path(path_parts, indices), str(e))
+            return object_to_norm
+        return normalize_bool
+
+    def _compile_int(self, prototype, path_parts):
+        strict_types = self._strict_types
+        stats = self.stats
+        type_converter = self._type_converter
+
+        def normalize_int(object_to_norm, indices):
+            if object_to_norm is None:
+                if stats is not None:
+                    stats.nulls_filled += 1
+                return None
+            if not isinstance(object_to_norm, int):
+                if strict_types:
+                    raise self._type_mismatch(prototype, object_to_norm, path_parts, indices)
+                if stats is not None:
+                    stats.type_conversions += 1
+                if object_to_norm == [] or object_to_norm == {} or isinstance(object_to_norm, str) and object_to_norm.strip() == "":
+                    return None
+                try:
+                    object_to_norm = int(type_converter(prototype, object_to_norm, _format_path(path_parts, indices)))
+                except Exception as e:
+                    raise NormalizeException(_format_path(path_parts, indices), f"can't parse int '{object_to_norm}': {e}")
+            return object_to_norm
+        return normalize_int
+
+    def _compile_float(self, prototype, path_parts):
+        strict_types = self._strict_types
+        stats = self.stats
+        type_converter = self._type_converter
+
+        def normalize_float(object_to_norm, indices):
+            if object_to_norm is None:
+                if stats is not None:
+                    stats.nulls_filled += 1
+                return None
+            if not isinstance(object_to_norm, (int, float)):
+                if strict_types:
+                    raise self._type_mismatch(prototype, object_to_norm, path_parts, indices)
+                if stats is not None:
+                    stats.type_conversions += 1
+                if object_to_norm == [] or object_to_norm == {} or isinstance(object_to_norm, str) and object_to_norm.strip() == "":
+                    return None
+                try:
+                    object_to_norm = float(type_converter(prototype, object_to_norm, _format_path(path_parts, indices)))
+                except Exception as e:
+                    raise NormalizeException(_format_path(path_parts, indices), f"can't parse float '{object_to_norm}': {e}")
+            if not isinstance(object_to_norm, float):
+                try:
+                    object_to_norm = float(object_to_norm)
+                except Exception as e:
+                    raise NormalizeException(_format_path(path_parts, indices), f"can't parse float '{object_to_norm}': {e}")
+            return object_to_norm
+        return normalize_float
+
+    def _compile_datetime(self, prototype, path_parts):
+        strict_types = self._strict_types
+        stats = self.stats
+        type_converter = self._type_converter
+
+        def normalize_datetime(object_to_norm, indices):
+            if object_to_norm is None:
+                if stats is not None:
+                    stats.nulls_filled += 1
+                return None
+            if not isinstance(object_to_norm, datetime.datetime):
+                if strict_types:
+                    raise self._type_mismatch(prototype, object_to_norm, path_parts, indices)
+                if stats is not None:
+                    stats.type_conversions += 1
+                if object_to_norm == [] or object_to_norm == {} or isinstance(object_to_norm, str) and object_to_norm.strip() == "":
+                    return None
+                try:
+                    object_to_norm = type_converter(prototype, object_to_norm, _format_path(path_parts, indices))
+                    if not isinstance(object_to_norm, datetime.datetime):
+                        object_to_norm = datetime.datetime.fromisoformat(object_to_norm)
+                except Exception as e:
+                    raise NormalizeException(_format_path(path_parts, indices), f"can't parse datetime fromisoformat '{object_to_norm}': {e}")
+            return object_to_norm
+        return normalize_datetime
+
+    def _compile_date(self, prototype, path_parts):
+        strict_types = self._strict_types
+        stats = self.stats
+        type_converter = self._type_converter
+
+        def normalize_date(object_to_norm, indices):
+            if object_to_norm is None:
+                if stats is not None:
+                    stats.nulls_filled += 1
+                return None
+            if not isinstance(object_to_norm, datetime.date):
+                if strict_types:
+                    raise self._type_mismatch(prototype, object_to_norm, path_parts, indices)
+                if stats is not None:
+                    stats.type_conversions += 1
+                if object_to_norm == [] or object_to_norm == {} or isinstance(object_to_norm, str) and object_to_norm.strip() == "":
+                    return None
+                try:
+                    object_to_norm = type_converter(prototype, object_to_norm, _format_path(path_parts, indices))
+                    if not isinstance(object_to_norm, datetime.date):
+                        object_to_norm = datetime.date.fromisoformat(object_to_norm)
+                except Exception as e:
+                    raise NormalizeException(_format_path(path_parts, indices), f"can't parse date fromisoformat '{object_to_norm}': {e}")
+            if isinstance(object_to_norm, datetime.datetime):
+                object_to_norm = object_to_norm.date()
+            return object_to_norm
+        return normalize_date
+
+
+def compile_prototype(prototype, freestyle_attrs_name="freestyle_attrs", pass_through_paths=[], strict_types=True,
+                      type_converter=None, collect_stats=False) -> CompiledPrototype:
+    """
+    Compile a prototype into a reusable normalizer, so that normalizing many objects against the same prototype
+    doesn't walk the prototype again for every object.
+
+    `compile_prototype(prototype, **options)(object_to_norm)` returns the same as
+    `normalize_with_prototype(prototype, object_to_norm, **options)`. See `normalize_with_prototype` for parameters.
+
+    :param collect_stats: if True, the normalizer counts conversions, filled nulls and freestyle attributes
+        in its `stats` attribute.
+    """
+    return CompiledPrototype(prototype, freestyle_attrs_name=freestyle_attrs_name,
+                             pass_through_paths=pass_through_paths, strict_types=strict_types,
+                             type_converter=type_converter, collect_stats=collect_stats)
+
+
+class NormalizeManyResult:
+    """
+    Result of `normalize_many()`.
+
+    - `records`: list of normalized records (without the ones that failed)
+    - `errors`: list of `(index, NormalizeException)` tuples, for records that failed (only with collect_errors=True)
+    - `stats`: `NormalizeStats`
+    """
+    def __init__(self, records: list, errors: list, stats: NormalizeStats):
+        self.records = records
+        self.errors = errors
+        self.stats = stats
+
+
+def normalize_many(prototype, records, freestyle_attrs_name="freestyle_attrs", pass_through_paths=[],
+                   strict_types=True, type_converter=None, collect_errors=False) -> NormalizeManyResult:
+    """
+    Normalize many objects (i.e. a whole page) against one prototype, compiling the prototype only once.
+
+    :param prototype: A prototype dict, for example from Swagger doc.
+    :param records: list or iterator of dicts that come from API.
+    :param collect_errors: if False, the first `NormalizeException` is raised. If True, failed records are skipped
+        and their errors are returned in `errors` of the result.
+    :return: `NormalizeManyResult`. See `normalize_with_prototype` for other parameters.
+    """
+    normalize = compile_prototype(prototype, freestyle_attrs_name=freestyle_attrs_name,
+                                  pass_through_paths=pass_through_paths, strict_types=strict_types,
+                                  type_converter=type_converter, collect_stats=True)
+    if not collect_errors:
+        return NormalizeManyResult([normalize(record) for record in records], [], normalize.stats)
+
+    normalized_records = []
+    errors = []
+    for idx, record in enumerate(records):
+        try:
+            normalized_records.append(normalize(record))
+        except NormalizeException as e:
+            errors.append((idx, e))
+    return NormalizeManyResult(normalized_records, errors, normalize.stats)
+
 
 def normalize_with_prototype(prototype, object_to_norm, freestyle_attrs_name="freestyle_attrs", pass_through_paths=[],
                              strict_types=True, type_converter=None):
     """
     Normalize python dict, so that it has all the fields and only the fields specified in a prototype dict.
 
+    To normalize many objects against one prototype use `compile_prototype()`, which is faster.
+
     :param prototype: A prototype dict, for example from Swagger doc.
     :param object_to_norm: A dict that comes from API.
     :param freestyle_attrs_name: it is a name for attribute, when prototype contains a dict like this: "field": {"": ""}
@@ -26,139 +421,6 @@ def normalize_with_prototype(prototype, object_to_norm, freestyle_attrs_name="fr
         called only when strict_types=False and type(prototype_object) != type(object_to_norm)
     :return:
     """
-    if not type_converter:
-        type_converter = lambda prototype_object, object_to_norm, path_info: object_to_norm
-
-    def normalize_with_prototype_rec(prototype, object_to_norm, path_info, prototype_path):
-        try:
-            if prototype_path in pass_through_paths:
-                return object_to_norm
-            if isinstance(prototype, dict):
-                if object_to_norm is None:
-                    object_to_norm = {}
-                elif not isinstance(object_to_norm, dict) and not strict_types:
-                    object_to_norm = type_converter(prototype, object_to_norm, path_info)
-                if not isinstance(object_to_norm, dict):
-                    raise NormalizeException(path_info, f"object_to_norm is not dict (of value {object_to_norm})")
-                normalized_object = {}
-                for k, v in prototype.items():
-                    if k != "":
-                        normalized_object[k] = normalize_with_prototype_rec(prototype[k], object_to_norm.get(k), path_info=f"{path_info}.{k}", prototype_path=f"{prototype_path}.{k}" if prototype_path != "" else k)
-                    else:
-                        normalized_object[freestyle_attrs_name] = [
-                            {"key": key, "value": value} for key, value in object_to_norm.items() if key not in prototype.keys() or key == ""
-                        ]
-                return normalized_object
-            elif isinstance(prototype, list):
-                if object_to_norm is None:
-                    object_to_norm = []
-                elif not isinstance(object_to_norm, list) and not strict_types:
-                    object_to_norm = type_converter(prototype, object_to_norm, path_info)
-                if not isinstance(object_to_norm, list):
-                    raise NormalizeException(path_info, f"object_to_norm is not list (of value {object_to_norm})")
-                return [normalize_with_prototype_rec(prototype[0], e, path_info=f"{path_info}[{idx}]", prototype_path=prototype_path) for idx, e in enumerate(object_to_norm)]
-            elif isinstance(prototype, str):
-                if object_to_norm is None:
-                    return None
-                if type(prototype) != type(object_to_norm):
-                    if strict_types:
-                        raise NormalizeException(path_info, f"type(prototype) != type(object_to_norm): {type(prototype)} != {type(object_to_norm)} (of value {object_to_norm})")
-                    else:
-                        return str(type_converter(prototype, object_to_norm, path_info))
-                return object_to_norm
-            elif isinstance(prototype, bool):
-                if object_to_norm is None:
-                    return None
-                if type(prototype) != type(object_to_norm):
-                    if strict_types:
-                        raise NormalizeException(path_info, f"type(prototype) != type(object_to_norm): {type(prototype)} != {type(object_to_norm)} (of value {object_to_norm})")
-                    else:
-                        object_to_norm = type_converter(prototype, object_to_norm, path_info)
-                        if not isinstance(object_to_norm, bool):
-                            if isinstance(object_to_norm, str):
-                                if object_to_norm.lower().strip() in {'1', 'true', 'yes'}:
-                                    object_to_norm = True
-                                elif object_to_norm.lower().strip() in {'0', 'false', 'no'}:
-                                    object_to_norm = False
-                                else:
-                                    object_to_norm = None
-                            else:
-                                object_to_norm = bool(object_to_norm)
-                return object_to_norm
-            elif isinstance(prototype, int):
-                if object_to_norm is None:
-                    return None
-                if not isinstance(object_to_norm, int):
-                    if strict_types:
-                        raise NormalizeException(path_info, f"type(prototype) != type(object_to_norm): {type(prototype)} != {type(object_to_norm)} (of value {object_to_norm})")
-                    else:
-                        if object_to_norm == [] or object_to_norm == {} or isinstance(object_to_norm, str) and object_to_norm.strip() == "":
-                            return None
-                        try:
-                            object_to_norm = int(type_converter(prototype, object_to_norm, path_info))
-                        except Exception as e:
-                            raise NormalizeException(path_info, f"can't parse int '{object_to_norm}': {e}")
-                return object_to_norm
-            elif isinstance(prototype, float):
-                if object_to_norm is None:
-                    return None
-                if not isinstance(object_to_norm, (int, float)):
-                    if strict_types:
-                        raise NormalizeException(path_info, f"type(prototype) != type(object_to_norm): {type(prototype)} != {type(object_to_norm)} (of value {object_to_norm})")
-                    else:
-                        if object_to_norm == [] or object_to_norm == {} or isinstance(object_to_norm, str) and object_to_norm.strip() == "":
-                            return None
-                        try:
-                            object_to_norm = float(type_converter(prototype, object_to_norm, path_info))
-                        except Exception as e:
-                            raise NormalizeException(path_info, f"can't parse float '{object_to_norm}': {e}")
-                if not isinstance(object_to_norm, float):
-                    try:
-                        object_to_norm = float(object_to_norm)
-                    except Exception as e:
-                        raise NormalizeException(path_info, f"can't parse float '{object_to_norm}': {e}")
-                return object_to_norm
-            elif isinstance(prototype, datetime.datetime):
-                # datetime.datetime() is an instance of both datetime.datetime and datetime.date.
-                # datetime.date() is NOT an instance of datetime.datetime
-                # that's why `isinstance(prototype, datetime.datetime)` check comes before `isinstance(prototype, datetime.date)`.
-                if object_to_norm is None:
-                    return None
-                if not isinstance(object_to_norm, datetime.datetime):
-                    if strict_types:
-                        raise NormalizeException(path_info, f"type(prototype) != type(object_to_norm): {type(prototype)} != {type(object_to_norm)} (of value {object_to_norm})")
-                    else:
-                        if object_to_norm == [] or object_to_norm == {} or isinstance(object_to_norm, str) and object_to_norm.strip() == "":
-                            return None
-                        try:
-                            object_to_norm = type_converter(prototype, object_to_norm, path_info)
-                            if not isinstance(object_to_norm, datetime.datetime):
-                                object_to_norm = datetime.datetime.fromisoformat(object_to_norm)
-                        except Exception as e:
-                            raise NormalizeException(path_info, f"can't parse datetime fromisoformat '{object_to_norm}': {e}")
-                return object_to_norm
-            elif isinstance(prototype, datetime.date):
-                if object_to_norm is None:
-                    return None
-                if not isinstance(object_to_norm, datetime.date):
-                    if strict_types:
-                        raise NormalizeException(path_info, f"type(prototype) != type(object_to_norm): {type(prototype)} != {type(object_to_norm)} (of value {object_to_norm})")
-                    else:
-                        if object_to_norm == [] or object_to_norm == {} or isinstance(object_to_norm, str) and object_to_norm.strip() == "":
-                            return None
-                        try:
-                            object_to_norm = type_converter(prototype, object_to_norm, path_info)
-                            if not isinstance(object_to_norm, datetime.date):
-                                object_to_norm = datetime.date.fromisoformat(object_to_norm)
-                        except Exception as e:
-                            raise NormalizeException(path_info, f"can't parse date fromisoformat '{object_to_norm}': {e}")
-                if isinstance(object_to_norm, datetime.datetime):
-                    object_to_norm = object_to_norm.date()
-                return object_to_norm
-            else:
-                raise NormalizeException(path_info, f"prototype data type not supported: {type(prototype)}")
-        except NormalizeException as e:
-            raise
-        except Exception as e:
-            raise NormalizeException(path_info, str(e))
-    return normalize_with_prototype_rec(prototype, object_to_norm, "", "")
+    return compile_prototype(prototype, freestyle_attrs_name=freestyle_attrs_name,
+                             pass_through_paths=pass_through_paths, strict_types=strict_types,
+                             type_converter=type_converter)(object_to_norm)
@@ -0,0 +1,147 @@
+import collections
+import concurrent.futures
+import functools
+import itertools
+import os
+
+from .normalize_dicts import normalize_dicts
+from .normalize_with_prototype import compile_prototype
+
+# normalizer of the worker process, built once by `_init_worker()`
+_worker_normalize_page = None
+
+
+def _init_worker(normalizer_factory, factory_args):
+    global _worker_normalize_page
+    _worker_normalize_page = normalizer_factory(*factory_args)
+
+
+def _normalize_chunk(pages: list) -> list:
+    return [_worker_normalize_page(page) for page in pages]
+
+
+def _dicts_page_normalizer(path, kwargs):
+    return functools.partial(normalize_dicts, path=path, **kwargs)
+
+
+def _prototype_page_normalizer(prototype, kwargs):
+    normalize = compile_prototype(prototype, **kwargs)
+    return lambda page: [normalize(record) for record in page]
+
+
+class ParallelNormalizeIterator:
+    """
+    Normalizes pages on a process pool and yields normalized pages in the order of input pages.
+    Created by `parallel_normalize_dicts()` and `parallel_normalize_with_prototype()`.
+
+    Normalization settings are sent to each worker process only once, when it starts. Pages are sent in chunks
+    of `chunk_size`, and at most `max_pending_chunks` chunks are in flight, so that input is not read ahead
+    without limit. Call `close()` to stop the workers before input is exhausted.
+    """
+    def __init__(self, pages, normalizer_factory, factory_args: tuple, max_workers: int = None, chunk_size: int = 1,
+                 max_pending_chunks: int = None, mp_context=None):
+        if max_workers is not None and max_workers < 1:
+            raise Exception(f"Wrong parameter value max_workers={max_workers}")
+        if chunk_size < 1:
+            raise Exception(f"Wrong parameter value chunk_size={chunk_size}")
+        if max_pending_chunks is not None and max_pending_chunks < 1:
+            raise Exception(f"Wrong parameter value max_pending_chunks={max_pending_chunks}")
+        self._pages = iter(pages)
+        self._normalizer_factory = normalizer_factory
+        self._factory_args = factory_args
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+        self._max_pending_chunks = max_pending_chunks
+        self._mp_context = mp_context
+        self._executor = None
+        self._futures = collections.deque()
+        self._results = collections.deque()
+        self._input_exhausted = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self._results:
+            if self._executor is None:
+                self._start()
+            self._submit_chunks()
+            if not self._futures:
+                self.close()
+                raise StopIteration
+            future = self._futures.popleft()
+            try:
+                self._results.extend(future.result())
+            except BaseException:
+                self.close()
+                raise
+            self._submit_chunks()
+        return self._results.popleft()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._input_exhausted = True
+        self._results.clear()
+        while self._futures:
+            self._futures.popleft().cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def _start(self):
+        max_workers = self._max_workers or os.cpu_count() or 1
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=self._mp_context, initializer=_init_worker,
+            initargs=(self._normalizer_factory, self._factory_args))
+        if self._max_pending_chunks is None:
+            self._max_pending_chunks = 2 * max_workers
+
+    def _submit_chunks(self):
+        while not self._input_exhausted and len(self._futures) < self._max_pending_chunks:
+            chunk = list(itertools.islice(self._pages, self._chunk_size))
+            if not chunk:
+                self._input_exhausted = True
+                return
+            self._futures.append(self._executor.submit(_normalize_chunk, chunk))
+
+
+def parallel_normalize_dicts(pages, path: list, max_workers: int = None, chunk_size: int = 1,
+                             max_pending_chunks: int = None, mp_context=None, **kwargs) -> ParallelNormalizeIterator:
+    """
+    Runs `normalize_dicts()` on every page from `pages` on a process pool, i.e.
+    `parallel_normalize_dicts(PaginatedApiIterator(...), ["pets"], max_workers=8)`.
+
+    :param pages: iterable of pages, each page being a list of records.
+    :param path: see `normalize_dicts()`.
+    :param max_workers: number of worker processes, defaults to the number of CPUs.
+    :param chunk_size: number of pages sent to a worker at once. Larger chunks lower the overhead for small pages.
+    :param max_pending_chunks: max number of chunks in flight, defaults to 2 * max_workers.
+    :param mp_context: multiprocessing context, see `concurrent.futures.ProcessPoolExecutor`.
+    :param kwargs: other parameters of `normalize_dicts()`.
+    :return: iterator of normalized pages, in the same order as `pages`.
+    """
+    return ParallelNormalizeIterator(pages, _dicts_page_normalizer, (path, kwargs), max_workers=max_workers,
+                                     chunk_size=chunk_size, max_pending_chunks=max_pending_chunks,
+                                     mp_context=mp_context)
+
+
+def parallel_normalize_with_prototype(pages, prototype, max_workers: int = None, chunk_size: int = 1,
+                                      max_pending_chunks: int = None, mp_context=None,
+                                      **kwargs) -> ParallelNormalizeIterator:
+    """
+    Normalizes every record of every page from `pages` with `prototype` on a process pool. Each worker compiles
+    the prototype once (see `compile_prototype()`).
+
+    `type_converter`, if given, must be picklable, i.e. a module level function.
+
+    :param kwargs: other parameters of `compile_prototype()`.
+    :return: iterator of normalized pages, in the same order as `pages`.
+        See `parallel_normalize_dicts()` for other parameters.
+    """
+    return ParallelNormalizeIterator(pages, _prototype_page_normalizer, (prototype, kwargs), max_workers=max_workers,
+                                     chunk_size=chunk_size, max_pending_chunks=max_pending_chunks,
+                                     mp_context=mp_context)
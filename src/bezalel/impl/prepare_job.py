@@ -2,6 +2,39 @@ import requests
 import time
 import logging
 
+from .http_utils import send_request
+
+
+def _job_headers(extra_headers: dict) -> dict:
+    return {
+        "Content-type": "application/json",
+        "Accept": "application/json",
+        **extra_headers
+    }
+
+
+def _submit_job(session: requests.Session, url: str, headers: dict, extra_params: dict,
+                response_job_id_field_name: str, timeout, retry_policy, rate_limiter):
+    response = send_request(session, "POST", url, retry_policy=retry_policy, rate_limiter=rate_limiter,
+                            headers=headers, json={**extra_params}, timeout=timeout)
+    return response.json()[response_job_id_field_name]
+
+
+def _poll_job(session: requests.Session, url: str, job_id, headers: dict, response_state_field_name: str, timeout,
+              retry_policy, rate_limiter):
+    """
+    Returns state of the job and the whole response.
+    """
+    logger = logging.getLogger(__name__)
+    state_response = send_request(session, "GET", f"{url}/{job_id}", retry_policy=retry_policy,
+                                  rate_limiter=rate_limiter, raise_for_status=False, headers=headers,
+                                  timeout=timeout)
+    state_response_json = state_response.json()
+    logger.debug(state_response_json)
+    state = state_response_json[response_state_field_name]
+    logger.debug(f"state: {state}")
+    return state, state_response_json
+
 
 def prepare_job(session: requests.Session, url: str,
                 response_job_id_field_name: str,
@@ -11,29 +44,21 @@ def prepare_job(session: requests.Session, url: str,
                 extra_params: dict = {}, extra_headers: dict = {},
                 wait_delay_seconds=5,
                 timeout=(10, 60),
+                retry_policy=None,
+                rate_limiter=None,
                 ):
-    logger = logging.getLogger(__name__)
-    requestHeaders = {
-        "Content-type": "application/json",
-        "Accept": "application/json",
-        **extra_headers
-    }
-    response = session.post(url, headers=requestHeaders, json={**extra_params}, timeout=timeout)
-    response.raise_for_status()
+    requestHeaders = _job_headers(extra_headers)
+    job_id = _submit_job(session, url, requestHeaders, extra_params, response_job_id_field_name, timeout,
+                         retry_policy, rate_limiter)
 
-    job_id = response.json()[response_job_id_field_name]
     state = waiting_states[0]
     state_response_json = None
     while state in waiting_states:
         time.sleep(wait_delay_seconds)
-        state_response = session.get(f"{url}/{job_id}", headers=requestHeaders, timeout=timeout)
-        state_response_json = state_response.json()
-        logger.debug(state_response_json)
-        state = state_response_json[response_state_field_name]
-        logger.debug(f"state: {state}")
+        state, state_response_json = _poll_job(session, url, job_id, requestHeaders, response_state_field_name,
+                                               timeout, retry_policy, rate_limiter)
 
     if state not in successful_states:
         raise Exception(f"Job failed with state {state}. Response {state_response_json}")
 
     return job_id
-
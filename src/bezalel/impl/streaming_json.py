@@ -0,0 +1,77 @@
+def _import_ijson():
+    try:
+        import ijson
+    except ImportError as e:
+        raise ImportError("Streaming JSON decoding requires `ijson` package. "
+                          "Install it with `pip install bezalel[streaming]`.") from e
+    return ijson
+
+
+class StreamedPage:
+    """
+    Iterator over records of a single page, decoded incrementally from an HTTP response stream.
+
+    Records are taken from the array found at `records_path` (a dotted path, like in `dict_get`). Everything else in
+    the payload is collected into `document`, where the records array is left empty. `document` is complete only
+    after the page is exhausted, see `drain()`.
+    """
+    def __init__(self, response, records_path: str):
+        ijson = _import_ijson()
+        response.raw.decode_content = True
+        self._response = response
+        self._events = ijson.parse(response.raw, use_float=True)
+        self._records_item_prefix = f"{records_path}.item"
+        self._document_builder = ijson.ObjectBuilder()
+        self._object_builder_class = ijson.ObjectBuilder
+        self._exhausted = False
+        self.document = None
+        self.records_count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._exhausted:
+            raise StopIteration
+        try:
+            record_builder = None
+            depth = 0
+            for prefix, event, value in self._events:
+                if record_builder is not None:
+                    record_builder.event(event, value)
+                    if event == "start_map" or event == "start_array":
+                        depth += 1
+                    elif event == "end_map" or event == "end_array":
+                        depth -= 1
+                        if depth == 0:
+                            self.records_count += 1
+                            return record_builder.value
+                elif prefix == self._records_item_prefix:
+                    if event == "start_map" or event == "start_array":
+                        record_builder = self._object_builder_class()
+                        record_builder.event(event, value)
+                        depth = 1
+                    else:
+                        self.records_count += 1
+                        return value
+                else:
+                    self._document_builder.event(event, value)
+        except BaseException:
+            self.close()
+            raise
+
+        self.document = getattr(self._document_builder, "value", None)
+        self.close()
+        raise StopIteration
+
+    def drain(self) -> dict:
+        """
+        Skips remaining records and returns `document`.
+        """
+        for _ in self:
+            pass
+        return self.document
+
+    def close(self):
+        self._exhausted = True
+        self._response.close()
@@ -1,6 +1,7 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 import uvicorn
 from pydantic import BaseModel
+from typing import Optional
 
 
 app = FastAPI()
@@ -36,6 +37,37 @@ async def root(pageNumber: int):
         }
 
 
+@app.get("/page-api-nested")
+async def page_api_nested(pageNumber: int):
+    pageIndex = pageNumber-1
+    assert pageIndex < len(pages)
+    assert pageIndex >= 0
+
+    return {
+        "result": {
+            "entities": pages[pageIndex],
+            },
+        "pageCount": len(pages),
+        }
+
+
+flaky_page_calls = {}
+
+
+@app.get("/page-api-flaky")
+async def page_api_flaky(pageNumber: int, run: str, response: Response):
+    """
+    Every page fails with 503 on the first call within a run.
+    """
+    flaky_page_calls[(run, pageNumber)] = flaky_page_calls.get((run, pageNumber), 0) + 1
+    if flaky_page_calls[(run, pageNumber)] == 1:
+        response.status_code = 503
+        response.headers["Retry-After"] = "0"
+        return {}
+
+    return await root(pageNumber)
+
+
 @app.get("/page-api-no-results")
 async def page_api_no_results(pageNumber: int):
     return {
@@ -104,6 +136,58 @@ async def paginate_api_post_total_records(request: ComplexRequest):
         }
 
 
+@app.get("/cursor-api")
+async def cursor_api(cursor: Optional[str] = None):
+    pageIndex = int(cursor) if cursor else 0
+    assert pageIndex < len(pages)
+
+    return {
+        "nextCursor": str(pageIndex + 1) if pageIndex + 1 < len(pages) else None,
+        "entities": pages[pageIndex],
+        }
+
+
+jobs = {}
+
+
+class JobRequest(BaseModel):
+    polls: int = 1
+    fail: bool = False
+
+
+@app.post("/jobs")
+async def create_job(request: JobRequest):
+    job_id = str(len(jobs) + 1)
+    jobs[job_id] = {"polls_left": request.polls, "fail": request.fail}
+    return {"jobId": job_id}
+
+
+@app.get("/jobs/{job_id}")
+async def job_state(job_id: str):
+    """
+    Job is RUNNING for the number of polls given when it was created, then it's DONE (or FAILED).
+    """
+    job = jobs[job_id]
+    job["polls_left"] -= 1
+    if job["polls_left"] > 0:
+        state = "RUNNING"
+    else:
+        state = "FAILED" if job["fail"] else "DONE"
+    return {"jobId": job_id, "state": state}
+
+
+@app.get("/jobs/{job_id}/result")
+async def job_result(job_id: str, pageNumber: int):
+    pageIndex = pageNumber-1
+    assert pageIndex < len(pages)
+    assert pageIndex >= 0
+
+    return {
+        "pageCount": len(pages),
+        "entities": [{"jobId": job_id, **record} for record in pages[pageIndex]],
+        }
+
+
 def run_uvicorn_server():
     uvicorn.run(app, host="localhost", port=5000, log_level="info")
 
@@ -0,0 +1,63 @@
+import asyncio
+
+import httpx
+from bezalel import AsyncPaginatedApiIterator, AsyncCursorApiIterator
+from unittest import TestCase
+from mock_service import generate_pages
+
+
+async def collect_pages(iterator):
+    pages = []
+    async for page in iterator:
+        pages.append(page)
+    return pages
+
+
+async def fetch_paginated(**kwargs):
+    async with httpx.AsyncClient() as client:
+        return await collect_pages(AsyncPaginatedApiIterator(client, url=f"http://localhost:5000/page-api",
+                                                             request_page_number_param_name="pageNumber",
+                                                             response_page_count_field_name="pageCount",
+                                                             response_records_field_name="entities",
+                                                             **kwargs))
+
+
+def test_AsyncPaginatedApiIterator(mock_service):
+    pages = asyncio.run(fetch_paginated())
+
+    TestCase().assertListEqual(generate_pages(), pages)
+
+
+def test_AsyncPaginatedApiIterator_concurrent(mock_service):
+    pages = asyncio.run(fetch_paginated(max_workers=3))
+
+    TestCase().assertListEqual(generate_pages(), pages)
+
+
+def test_AsyncCursorApiIterator(mock_service):
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await collect_pages(AsyncCursorApiIterator(client, url=f"http://localhost:5000/cursor-api",
+                                                              method="GET",
+                                                              response_cursor_field_name="nextCursor",
+                                                              response_records_field_name="entities",
+                                                              request_cursor_param_name="cursor"))
+
+    pages = asyncio.run(fetch())
+
+    TestCase().assertListEqual(generate_pages(), pages)
+
+
+def test_AsyncPaginatedApiIterator_records(mock_service):
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            records = AsyncPaginatedApiIterator(client, url=f"http://localhost:5000/page-api",
+                                                request_page_number_param_name="pageNumber",
+                                                response_page_count_field_name="pageCount",
+                                                response_records_field_name="entities").records()
+            return [r async for r in records], records.pages_count
+
+    records, pages_count = asyncio.run(fetch())
+
+    TestCase().assertListEqual([r for page in generate_pages() for r in page], records)
+    assert pages_count == 4
@@ -0,0 +1,57 @@
+from bezalel import BufferingIterator
+from unittest import TestCase
+
+
+class TestBufferingIterator(TestCase):
+    pages = [[1, 2, 3], [4], [5, 6, 7, 8, 9], [10, 11]]
+
+    def test_buffer_size(self):
+        self.assertListEqual([[1, 2, 3, 4], [5, 6, 7, 8, 9, 10, 11]], list(BufferingIterator(self.pages, buffer_size=2)))
+
+    def test_max_records(self):
+        self.assertListEqual([[1, 2, 3, 4], [5, 6, 7, 8, 9], [10, 11]],
+                             list(BufferingIterator(self.pages, max_records=4)))
+
+    def test_max_bytes(self):
+        self.assertListEqual([[1, 2, 3], [4, 5, 6, 7, 8, 9], [10, 11]],
+                             list(BufferingIterator(self.pages, max_bytes=3, size_func=len)))
+
+    def test_max_seconds(self):
+        self.assertListEqual([[1, 2, 3], [4], [5, 6, 7, 8, 9], [10, 11]],
+                             list(BufferingIterator(self.pages, max_seconds=0)))
+
+    def test_combine_func(self):
+        self.assertListEqual([[[1, 2, 3], [4]], [[5, 6, 7, 8, 9]], [[10, 11]]],
+                             list(BufferingIterator(self.pages, max_records=4, combine_func=list)))
+
+    def test_empty(self):
+        self.assertListEqual([], list(BufferingIterator([], buffer_size=2)))
+
+    def test_no_limits(self):
+        with self.assertRaises(Exception):
+            BufferingIterator(self.pages)
+
+    def test_background(self):
+        self.assertListEqual([[1, 2, 3, 4], [5, 6, 7, 8, 9], [10, 11]],
+                             list(BufferingIterator(self.pages, max_records=4, background=True, queue_size=2)))
+
+    def test_background_error(self):
+        def pages():
+            yield [1, 2]
+            raise ValueError("broken page")
+
+        it = BufferingIterator(pages(), buffer_size=1, background=True)
+        self.assertListEqual([1, 2], next(it))
+        with self.assertRaises(ValueError):
+            next(it)
+
+    def test_background_close(self):
+        def pages():
+            while True:
+                yield [1]
+
+        it = BufferingIterator(pages(), buffer_size=1, background=True)
+        self.assertListEqual([1], next(it))
+        it.close()
+        with self.assertRaises(StopIteration):
+            next(it)
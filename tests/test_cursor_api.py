@@ -0,0 +1,61 @@
+import requests
+from bezalel import CursorApiIterator
+from unittest import TestCase
+from mock_service import generate_pages
+
+
+def cursor_api_iterator(**kwargs):
+    return CursorApiIterator(requests.Session(), url=f"http://localhost:5000/cursor-api", method="GET",
+                             response_cursor_field_name="nextCursor",
+                             response_records_field_name="entities",
+                             request_cursor_param_name="cursor",
+                             **kwargs)
+
+
+def test_CursorApiIterator(mock_service):
+    pages = list(cursor_api_iterator())
+
+    TestCase().assertListEqual(generate_pages(), pages)
+
+
+def test_CursorApiIterator_prefetch(mock_service):
+    pages = list(cursor_api_iterator(prefetch_pages=2))
+
+    TestCase().assertListEqual(generate_pages(), pages)
+
+
+def test_CursorApiIterator_prefetch_close(mock_service):
+    it = iter(cursor_api_iterator(prefetch_pages=1))
+    first_page = next(it)
+    it.close()
+
+    TestCase().assertListEqual(generate_pages()[0], first_page)
+
+
+def test_CursorApiIterator_stream_records(mock_service):
+    pages = [list(page) for page in cursor_api_iterator(stream_records=True)]
+
+    TestCase().assertListEqual(generate_pages(), pages)
+
+
+def test_CursorApiIterator_records_streamed(mock_service):
+    records = cursor_api_iterator(stream_records=True).records()
+
+    TestCase().assertListEqual([r for page in generate_pages() for r in page], list(records))
+    assert records.records_count == 12
+    assert records.pages_count == 4
+
+
+def test_CursorApiIterator_checkpoint_and_resume(mock_service):
+    states = []
+    pages = list(cursor_api_iterator(checkpoint_handler=states.append, prefetch_pages=2))
+
+    TestCase().assertListEqual(generate_pages(), pages)
+    TestCase().assertListEqual([{"next_cursor": "1", "page_number": 2, "completed": False},
+                                {"next_cursor": "2", "page_number": 3, "completed": False},
+                                {"next_cursor": "3", "page_number": 4, "completed": False},
+                                {"next_cursor": None, "page_number": 5, "completed": True}], states)
+
+    it = cursor_api_iterator()
+    it.restore_state(states[1])
+    TestCase().assertListEqual(generate_pages()[2:], list(it))
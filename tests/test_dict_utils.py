@@ -36,3 +36,24 @@ class TestDictUtils(TestCase):
         d = {"a": 123, "b": 456, "c": 555}
         dict_set(d, "c.d.e", 789)
         self.assertDictEqual({"a": 123, "b": 456, "c": {"d": {"e": 789}}}, d)
+
+    def test_dict_path(self):
+        d = {"a": {"b": [1, {"c": 5}], "x.y": 7}, "q": 3}
+        assert DictPath("a.b[1].c").get(d) == 5
+        assert DictPath("a.b[-2]").get(d) == 1
+        assert DictPath("a.b[2].c").get(d, default=-1) == -1
+        assert DictPath("q.b").get(d, default=-1) == -1
+        assert DictPath(r"a.x\.y").get(d) == 7
+        assert DictPath(r"a\.b").parts == ("a.b",)
+        assert DictPath(r"a\[0]").parts == ("a[0]",)
+        assert DictPath("a.b[1]").get(None, default=-1) == -1
+
+        DictPath("a.b[1].d.e").set(d, 9)
+        DictPath("q.r").set(d, 1)
+        self.assertDictEqual({"a": {"b": [1, {"c": 5, "d": {"e": 9}}], "x.y": 7}, "q": {"r": 1}}, d)
+
+    def test_dict_paths(self):
+        d = {"result": {"entities": [1, 2], "total": 2}, "pageCount": 4}
+        paths = DictPaths("pageCount", "result.entities", "result.total", "result.missing", "result")
+        self.assertTupleEqual((4, [1, 2], 2, None, {"entities": [1, 2], "total": 2}), paths.get(d))
+        self.assertTupleEqual((-1, -1, -1, -1, 1), paths.get({"result": 1}, default=-1))
@@ -0,0 +1,75 @@
+import requests
+from bezalel import JobManager, PaginatedApiIterator, prepare_job
+from mock_service import generate_pages
+from unittest import TestCase
+
+
+def job_manager(**kwargs):
+    return JobManager(requests.Session(), url=f"http://localhost:5000/jobs",
+                      response_job_id_field_name="jobId",
+                      response_state_field_name="state",
+                      successful_states=["DONE"],
+                      waiting_states=["RUNNING"],
+                      initial_poll_seconds=0.01,
+                      **kwargs)
+
+
+def test_prepare_job(mock_service):
+    job_id = prepare_job(requests.Session(), url=f"http://localhost:5000/jobs",
+                         response_job_id_field_name="jobId",
+                         response_state_field_name="state",
+                         successful_states=["DONE"],
+                         waiting_states=["RUNNING"],
+                         extra_params={"polls": 2},
+                         wait_delay_seconds=0.01)
+
+    assert job_id is not None
+
+
+def test_JobManager_as_completed(mock_service):
+    with job_manager(poll_backoff_factor=2) as manager:
+        slow = manager.submit({"polls": 4})
+        fast = manager.submit({"polls": 1})
+        failed = manager.submit({"polls": 2, "fail": True})
+        completed = list(manager.as_completed())
+
+    TestCase().assertListEqual([fast, failed, slow], completed)
+    assert fast.succeeded and slow.succeeded and slow.state == "DONE" and slow.polls == 4
+    assert not failed.succeeded and failed.state == "FAILED"
+    # polled after 0.01, 0.02, 0.04 and 0.08 seconds
+    assert slow.poll_seconds == 0.08
+
+
+def test_JobManager_deadline(mock_service):
+    with job_manager(max_poll_seconds=0.01, deadline_seconds=0.2) as manager:
+        job = manager.submit({"polls": 10000})
+        completed = list(manager.as_completed())
+
+    TestCase().assertListEqual([job], completed)
+    assert not job.succeeded and job.state == "RUNNING" and job.polls > 1
+
+
+def test_JobManager_download(mock_service):
+    def download(job):
+        if job.params.get("broken"):
+            raise Exception("download failed")
+        return list(PaginatedApiIterator(requests.Session(), url=f"http://localhost:5000/jobs/{job.job_id}/result",
+                                         request_page_number_param_name="pageNumber",
+                                         response_page_count_field_name="pageCount",
+                                         response_records_field_name="entities"))
+
+    with job_manager(max_poll_seconds=0.01) as manager:
+        slow = manager.submit({"polls": 30})
+        fast = manager.submit({"polls": 1})
+        failed = manager.submit({"polls": 1, "fail": True})
+        broken = manager.submit({"polls": 1, "broken": True})
+        completed = list(manager.as_completed(download_func=download))
+
+    TestCase().assertSetEqual({fast, failed, broken}, set(completed[:3]))
+    assert completed[3] is slow
+    assert not failed.succeeded and failed.result is None
+    assert not broken.succeeded and str(broken.error) == "download failed"
+    for job in (fast, slow):
+        assert job.succeeded
+        TestCase().assertListEqual([[{"jobId": job.job_id, **record} for record in page] for page in generate_pages()],
+                                   job.result)
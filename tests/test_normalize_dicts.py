@@ -1,5 +1,5 @@
 from pprint import pprint
-from bezalel import normalize_dicts
+from bezalel import normalize_dicts, iter_normalize_dicts, normalize_dicts_columnar, ShapeCache
 from unittest import TestCase
 import json
 
@@ -242,3 +242,68 @@ class TestNormalizeDicts(TestCase):
         result = normalize_dicts(data, ["fitness"], jsonify_lists=True, jsonify_dicts=["fitness.someDict"])
         print(result)
         TestCase().assertListEqual(expected_list, result)
+
+
+    def test_iter_normalize_dicts(self):
+        data = [
+            {"id": 1, "pets": [{"id": 101, "toys": [{"name": "toy1"}, {"name": "toy2"}]}]},
+            {"id": 2, "pets": [{"id": 201, "toys": []}, "not-a-dict"]},
+        ]
+        rows = iter_normalize_dicts(data, ["pets", "toys"])
+
+        TestCase().assertDictEqual({'id': 1, 'pets.id': 101, 'pets.toys.name': 'toy1'}, next(rows))
+        TestCase().assertDictEqual({'id': 1, 'pets.id': 101, 'pets.toys.name': 'toy2'}, next(rows))
+        TestCase().assertDictEqual({'id': 2, 'pets.id': 201}, next(rows))
+        with self.assertRaises(Exception):
+            next(rows)
+
+
+    def test_share_prefix(self):
+        data = [
+            {"id": 1, "name": "John", "pets": [{"id": 101, "toys": [{"name": "toy1"}, {"name": "toy2"}]}]},
+            {"id": 2, "pets": []},
+        ]
+        result = normalize_dicts(data, ["pets", "toys"], share_prefix=True)
+
+        TestCase().assertListEqual(normalize_dicts(data, ["pets", "toys"]), [dict(row) for row in result])
+        TestCase().assertListEqual(['id', 'name', 'pets.id', 'pets.toys.name'], list(result[0].keys()))
+        # parent fields are shared, not copied
+        assert result[0].maps[1] is result[1].maps[1]
+        assert result[0].maps[2] is result[1].maps[2]
+
+
+    def test_normalize_dicts_columnar(self):
+        data = [
+            {"id": 1, "name": "John", "pets": [{"id": 101, "toys": [{"name": "toy1"}, {"name": "toy2"}]}]},
+            {"id": 2, "pets": [], "age": 33},
+        ]
+        result = normalize_dicts_columnar(data, ["pets", "toys"])
+
+        assert result.row_count == 3
+        TestCase().assertListEqual(['id', 'name', 'pets.id', 'pets.toys.name', 'age'], result.schema)
+        TestCase().assertDictEqual({
+            'id': [1, 1, 2],
+            'name': ['John', 'John', None],
+            'pets.id': [101, 101, None],
+            'pets.toys.name': ['toy1', 'toy2', None],
+            'age': [None, None, 33],
+        }, result.columns)
+        TestCase().assertListEqual([{**{k: None for k in result.schema}, **row} for row in normalize_dicts(data, ["pets", "toys"])],
+                                   result.to_rows())
+
+    def test_normalize_dicts_shape_cache(self):
+        data = [
+            {"id": 1, "info": {"a": 1, "b": {"c": 2}}, "meta": {"x": 1}, "tags": [1, 2], "pets": [{"id": 101}, {"id": 102}]},
+            {"id": 2, "info": {"a": 3, "b": {"c": 4}}, "meta": {"x": 2}, "tags": [], "pets": [{"id": 201}]},
+            {"id": 3, "info": None, "meta": {"x": 3}, "tags": [3], "pets": [{"id": 301, "name": "Fury"}]},
+            {"pets": [], "id": 4},
+        ]
+        cache = ShapeCache()
+        for _ in range(2):
+            result = normalize_dicts(data, ["pets"], jsonify_lists=True, jsonify_dicts=["meta"], shape_cache=cache)
+            self.assertListEqual(normalize_dicts(data, ["pets"], jsonify_lists=True, jsonify_dicts=["meta"]), result)
+        self.assertEqual(7, len(cache))
+
+        limited_cache = ShapeCache(max_shapes=1)
+        self.assertListEqual(normalize_dicts(data, ["pets"]), normalize_dicts(data, ["pets"], shape_cache=limited_cache))
+        self.assertEqual(1, len(limited_cache))
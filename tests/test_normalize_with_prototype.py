@@ -1,4 +1,5 @@
-from bezalel import normalize_with_prototype
+from bezalel import normalize_with_prototype, compile_prototype, normalize_many
+from bezalel.impl.normalize_with_prototype import NormalizeException
 from unittest import TestCase
 
 class TestNormalizeWithPrototype(TestCase):
@@ -186,3 +187,43 @@ class TestNormalizeWithPrototype(TestCase):
 
         TestCase().assertDictEqual(expected_result, normalize_with_prototype(prototype_from_swagger, result, pass_through_paths=["pets.customDict"]))
         print(result)
+
+    def test_compile_prototype(self):
+        prototype_from_swagger = {
+            "id": 0,
+            "pets": [
+                {"id": 0, "name": "", "attrs": {"": ""}},
+            ]
+        }
+        normalize = compile_prototype(prototype_from_swagger, freestyle_attrs_name="extra")
+
+        TestCase().assertDictEqual({"id": 1, "pets": []}, normalize({"id": 1}))
+        TestCase().assertDictEqual({"id": 2, "pets": [{"id": 3, "name": None, "attrs": {"extra": [{"key": "a", "value": 1}]}}]},
+                                   normalize({"id": 2, "pets": [{"id": 3, "attrs": {"a": 1}}]}))
+
+        with self.assertRaises(NormalizeException) as cm:
+            normalize({"id": 2, "pets": [{"id": 3}, {"id": "4"}]})
+        assert str(cm.exception).startswith(".pets[1].id: type(prototype) != type(object_to_norm)")
+
+    def test_normalize_many(self):
+        prototype_from_swagger = {"id": 0, "name": "", "attrs": {"": ""}}
+        records = [
+            {"id": 1, "name": "John", "attrs": {"a": 1, "b": 2}},
+            {"id": "2"},
+            {"id": "three", "name": "Sue"},
+        ]
+
+        with self.assertRaises(NormalizeException):
+            normalize_many(prototype_from_swagger, records, strict_types=False)
+
+        result = normalize_many(prototype_from_swagger, iter(records), strict_types=False, collect_errors=True)
+
+        TestCase().assertListEqual([
+            {"id": 1, "name": "John", "attrs": {"freestyle_attrs": [{"key": "a", "value": 1}, {"key": "b", "value": 2}]}},
+            {"id": 2, "name": None, "attrs": {"freestyle_attrs": []}},
+        ], result.records)
+        assert [idx for idx, _ in result.errors] == [2]
+        assert str(result.errors[0][1]).startswith(".id: can't parse int 'three'")
+        assert result.stats.type_conversions == 2
+        assert result.stats.nulls_filled == 1
+        assert result.stats.freestyle_attrs == 2
@@ -1,10 +1,12 @@
 import sys, os
+import uuid
 
 print(f"sys.path: {sys.path}")
 print(f"PYTHONPATH: {os.environ.get('PYTHONPATH')}")
 
+import pytest
 import requests
-from bezalel import PaginatedApiIterator, BufferingIterator
+from bezalel import PaginatedApiIterator, BufferingIterator, RetryPolicy
 from unittest import TestCase
 from mock_service import generate_pages
 
@@ -115,3 +117,123 @@ def test_BufferingIterator(mock_service):
                        ]
 
     TestCase().assertListEqual(exptected_pages, pages)
+
+
+def test_PaginatedApiIterator_concurrent(mock_service):
+    pages = []
+    for page in PaginatedApiIterator(requests.Session(), url=f"http://localhost:5000/page-api",
+                                     request_page_number_param_name="pageNumber",
+                                     response_page_count_field_name="pageCount",
+                                     response_records_field_name="entities",
+                                     max_workers=3):
+        pages.append(page)
+
+    exptected_pages = generate_pages()
+
+    TestCase().assertListEqual(exptected_pages, pages)
+
+
+def test_PaginatedApiIterator_concurrent_unordered(mock_service):
+    pages = []
+    for page in PaginatedApiIterator(requests.Session(), url=f"http://localhost:5000/page-api",
+                                     request_page_number_param_name="pageNumber",
+                                     response_page_count_field_name="pageCount",
+                                     response_records_field_name="entities",
+                                     max_workers=3, preserve_order=False):
+        pages.append(page)
+
+    exptected_pages = generate_pages()
+
+    TestCase().assertCountEqual(exptected_pages, pages)
+
+
+def test_PaginatedApiIterator_stream_records(mock_service):
+    pages = []
+    for page in PaginatedApiIterator(requests.Session(), url=f"http://localhost:5000/page-api-nested",
+                                     request_page_number_param_name="pageNumber",
+                                     response_page_count_field_name="pageCount",
+                                     response_records_field_name="result.entities",
+                                     stream_records=True):
+        pages.append(list(page))
+
+    exptected_pages = generate_pages()
+
+    TestCase().assertListEqual(exptected_pages, pages)
+
+
+def test_PaginatedApiIterator_stream_records_partially_consumed(mock_service):
+    first_records = []
+    for page in PaginatedApiIterator(requests.Session(), url=f"http://localhost:5000/page-api-nested",
+                                     request_page_number_param_name="pageNumber",
+                                     response_page_count_field_name="pageCount",
+                                     response_records_field_name="result.entities",
+                                     stream_records=True):
+        first_records.append(next(page))
+
+    exptected_records = [page[0] for page in generate_pages()]
+
+    TestCase().assertListEqual(exptected_records, first_records)
+
+
+def test_PaginatedApiIterator_records(mock_service):
+    records = PaginatedApiIterator(requests.Session(), url=f"http://localhost:5000/page-api",
+                                   request_page_number_param_name="pageNumber",
+                                   response_page_count_field_name="pageCount",
+                                   response_records_field_name="entities").records()
+
+    TestCase().assertListEqual([r for page in generate_pages() for r in page], list(records))
+    assert records.records_count == 12
+    assert records.pages_count == 4
+
+
+def test_PaginatedApiIterator_retry(mock_service):
+    retry_policy = RetryPolicy(max_retries=2)
+    pages = []
+    for page in PaginatedApiIterator(requests.Session(), url=f"http://localhost:5000/page-api-flaky",
+                                     request_page_number_param_name="pageNumber",
+                                     response_page_count_field_name="pageCount",
+                                     response_records_field_name="entities",
+                                     extra_params={"run": str(uuid.uuid4())},
+                                     retry_policy=retry_policy):
+        pages.append(page)
+
+    exptected_pages = generate_pages()
+
+    TestCase().assertListEqual(exptected_pages, pages)
+    assert retry_policy.stats.retries == 4
+    assert retry_policy.stats.retried_statuses == {503: 4}
+    assert retry_policy.stats.backoff_seconds == 0
+
+
+def test_PaginatedApiIterator_no_retry(mock_service):
+    with pytest.raises(requests.HTTPError):
+        list(PaginatedApiIterator(requests.Session(), url=f"http://localhost:5000/page-api-flaky",
+                                  request_page_number_param_name="pageNumber",
+                                  response_page_count_field_name="pageCount",
+                                  response_records_field_name="entities",
+                                  extra_params={"run": str(uuid.uuid4())},
+                                  retry_policy=RetryPolicy(max_retries=0)))
+
+
+def test_PaginatedApiIterator_checkpoint_and_resume(mock_service):
+    def paginated_api_iterator(**kwargs):
+        return dict(session=requests.Session(), url=f"http://localhost:5000/page-api",
+                    request_page_number_param_name="pageNumber",
+                    response_page_count_field_name="pageCount",
+                    response_records_field_name="entities", **kwargs)
+
+    states = []
+    pages = list(PaginatedApiIterator(**paginated_api_iterator(checkpoint_handler=states.append,
+                                                               checkpoint_every_n_pages=2)))
+
+    TestCase().assertListEqual(generate_pages(), pages)
+    TestCase().assertListEqual([{"page_number": 3, "completed": False},
+                                {"page_number": 5, "completed": True}], states)
+
+    resumed_pages = list(PaginatedApiIterator.from_state(states[0], **paginated_api_iterator()))
+    TestCase().assertListEqual(generate_pages()[2:], resumed_pages)
+
+    resumed_pages = list(PaginatedApiIterator.from_state(states[0], **paginated_api_iterator(max_workers=2)))
+    TestCase().assertListEqual(generate_pages()[2:], resumed_pages)
+
+    assert list(PaginatedApiIterator.from_state(states[1], **paginated_api_iterator())) == []
@@ -0,0 +1,29 @@
+from bezalel import parallel_normalize_dicts, parallel_normalize_with_prototype, normalize_dicts, normalize_many
+from bezalel.impl.normalize_with_prototype import NormalizeException
+from unittest import TestCase
+
+
+def _pages(n):
+    return [[{"id": p * 10 + i, "tags": [{"name": f"t{i}"}, {"name": "x"}]} for i in range(3)] for p in range(n)]
+
+
+class TestParallelNormalize(TestCase):
+    def test_parallel_normalize_dicts(self):
+        pages = _pages(7)
+        with parallel_normalize_dicts(iter(pages), ["tags"], max_workers=2, chunk_size=3) as it:
+            result = list(it)
+        self.assertListEqual([normalize_dicts(page, ["tags"]) for page in pages], result)
+
+    def test_parallel_normalize_with_prototype(self):
+        pages = _pages(5)
+        prototype = {"id": 0, "tags": [{"name": ""}], "extra": 0}
+        result = list(parallel_normalize_with_prototype(pages, prototype, max_workers=2, max_pending_chunks=1))
+        self.assertListEqual([normalize_many(prototype, page).records for page in pages], result)
+
+    def test_parallel_normalize_error(self):
+        pages = [[{"id": 1}], [{"id": "x"}]]
+        it = parallel_normalize_with_prototype(pages, {"id": 0}, max_workers=1)
+        self.assertDictEqual({"id": 1}, next(it)[0])
+        with self.assertRaises(NormalizeException) as ctx:
+            next(it)
+        self.assertEqual(".id", ctx.exception._path)
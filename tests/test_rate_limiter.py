@@ -0,0 +1,43 @@
+import asyncio
+import threading
+import time
+from bezalel import RateLimiter
+from unittest import TestCase
+
+
+class TestRateLimiter(TestCase):
+    def test_burst_is_not_delayed(self):
+        limiter = RateLimiter(rate=10, burst=5)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        assert time.monotonic() - start < 0.05
+        assert limiter.wait_seconds == 0
+
+    def test_rate_is_kept_across_threads(self):
+        limiter = RateLimiter(rate=50, burst=1)
+
+        def worker():
+            for _ in range(5):
+                limiter.acquire()
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 20 requests, first one is free, the rest at 50/s
+        assert time.monotonic() - start >= 19 / 50 - 0.01
+        assert limiter.wait_seconds > 0
+
+    def test_async_acquire(self):
+        limiter = RateLimiter(rate=50, burst=1)
+
+        async def run():
+            await asyncio.gather(*[limiter.async_acquire() for _ in range(10)])
+
+        start = time.monotonic()
+        asyncio.run(run())
+        assert time.monotonic() - start >= 9 / 50 - 0.01
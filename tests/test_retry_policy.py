@@ -0,0 +1,60 @@
+import requests
+from bezalel import RetryPolicy
+from unittest import TestCase
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestRetryPolicy(TestCase):
+    def test_retry_delay_backoff(self):
+        policy = RetryPolicy(max_retries=3, backoff_factor=1, max_backoff_seconds=3, jitter=False)
+        assert policy.retry_delay(0, response=FakeResponse(503)) == 1
+        assert policy.retry_delay(1, response=FakeResponse(503)) == 2
+        assert policy.retry_delay(2, response=FakeResponse(503)) == 3
+        assert policy.retry_delay(3, response=FakeResponse(503)) is None
+
+    def test_retry_delay_jitter(self):
+        policy = RetryPolicy(backoff_factor=1, jitter=True)
+        for _ in range(100):
+            assert 0 <= policy.retry_delay(2, response=FakeResponse(429)) <= 4
+
+    def test_retry_delay_not_retryable(self):
+        policy = RetryPolicy()
+        assert policy.retry_delay(0, response=FakeResponse(200)) is None
+        assert policy.retry_delay(0, response=FakeResponse(404)) is None
+        assert policy.retry_delay(0, exception=ValueError()) is None
+        assert policy.retry_delay(0, exception=requests.ConnectionError()) is not None
+
+    def test_retry_after(self):
+        policy = RetryPolicy(max_backoff_seconds=1)
+        assert policy.retry_delay(0, response=FakeResponse(429, {"Retry-After": "120"})) == 120
+        assert policy.retry_delay(0, response=FakeResponse(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0
+        assert policy.retry_delay(0, response=FakeResponse(429, {"Retry-After": "soon"})) <= 1
+
+    def test_send(self):
+        responses = [FakeResponse(503, {"Retry-After": "0"}), FakeResponse(429, {"Retry-After": "0"}), FakeResponse(200)]
+        policy = RetryPolicy()
+        response = policy.send(lambda: responses.pop(0))
+
+        assert response.status_code == 200
+        assert policy.stats.requests == 3
+        assert policy.stats.retries == 2
+        assert policy.stats.retried_statuses == {503: 1, 429: 1}
+
+    def test_send_exception(self):
+        def send():
+            raise requests.ConnectionError("refused")
+
+        policy = RetryPolicy(max_retries=2, backoff_factor=0)
+        with self.assertRaises(requests.ConnectionError):
+            policy.send(send)
+        assert policy.stats.requests == 3
+        assert policy.stats.retried_exceptions == {"ConnectionError": 2}